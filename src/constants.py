@@ -14,6 +14,8 @@ HIGHLIGHT = (255, 253, 208)
 LEGAL_MOVE_HIGHLIGHT = (144, 238, 144, 100)
 ENGINE_MOVE_START = (255, 140, 0, 120)
 ENGINE_MOVE_END = (255, 215, 0, 140)
+# Tile fill by shade index (q - r) % 3
+HEX_PALETTE = (GREY, WHITE, BLACK)
 
 # Piece values in centipawns
 PIECE_VALUES = {
@@ -36,4 +38,63 @@ PHASE_VALUES = {
     'king': 0
 }
 
+# Axial step directions: orthogonal (rook) and diagonal (bishop)
+ORTHOGONAL_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1))
+DIAGONAL_DIRECTIONS = ((1, 1), (-1, -1), (2, -1), (-2, 1), (1, -2), (-1, 2))
+# Knight jumps: two orthogonal steps, then one step to either side.
+# The set is symmetric, so it also lists the squares a knight attacks from.
+KNIGHT_OFFSETS = (
+    (2, 1), (3, -1), (-2, -1), (-3, 1), (-1, 3), (1, 2),
+    (1, -3), (-1, -2), (3, -2), (2, -3), (-3, 2), (-2, 3)
+)
+
+# Squares a pawn of each color captures toward
+PAWN_CAPTURE_DIRECTIONS = {
+    "white": ((-1, 0), (1, -1)),
+    "black": ((1, 0), (-1, 1)),
+}
+
+# Side to move after the given color
+OPPONENT = {"white": "black", "black": "white"}
+
+# Pawn starting squares (a two-square advance is allowed from these)
+WHITE_PAWN_STARTS = frozenset({
+    (-4, 5), (-3, 4), (-2, 3), (-1, 2), (0, 1),
+    (1, 1), (2, 1), (3, 1), (4, 1)
+})
+BLACK_PAWN_STARTS = frozenset({
+    (4, -5), (3, -4), (2, -3), (1, -2), (0, -1),
+    (-1, -1), (-2, -1), (-3, -1), (-4, -1)
+})
+
+# Squares on which a pawn of the given color promotes (the opposing back rank)
+PROMOTION_SQUARES = {
+    "white": frozenset({
+        (4, -5), (3, -5), (2, -5), (1, -5), (0, -5),
+        (-1, -4), (-2, -3), (-3, -2), (-4, -1)
+    }),
+    "black": frozenset({
+        (-4, 5), (-3, 5), (-2, 5), (-1, 5), (0, 5),
+        (1, 4), (2, 3), (3, 2), (4, 1)
+    }),
+}
+
+# Starting position as (q, r, color, piece_name)
+INITIAL_SETUP = (
+    # White
+    (1, 4, "white", "king"), (-1, 5, "white", "queen"), (3, 2, "white", "rook"),
+    (-3, 5, "white", "rook"), (2, 3, "white", "knight"), (-2, 5, "white", "knight"),
+    (0, 5, "white", "bishop"), (0, 4, "white", "bishop"), (0, 3, "white", "bishop"),
+    (-4, 5, "white", "pawn"), (-3, 4, "white", "pawn"), (-2, 3, "white", "pawn"),
+    (-1, 2, "white", "pawn"), (0, 1, "white", "pawn"), (1, 1, "white", "pawn"),
+    (2, 1, "white", "pawn"), (3, 1, "white", "pawn"), (4, 1, "white", "pawn"),
+    # Black
+    (1, -5, "black", "king"), (-1, -4, "black", "queen"), (3, -5, "black", "rook"),
+    (-3, -2, "black", "rook"), (2, -5, "black", "knight"), (-2, -3, "black", "knight"),
+    (0, -5, "black", "bishop"), (0, -4, "black", "bishop"), (0, -3, "black", "bishop"),
+    (4, -5, "black", "pawn"), (3, -4, "black", "pawn"), (2, -3, "black", "pawn"),
+    (1, -2, "black", "pawn"), (0, -1, "black", "pawn"), (-1, -1, "black", "pawn"),
+    (-2, -1, "black", "pawn"), (-3, -1, "black", "pawn"), (-4, -1, "black", "pawn"),
+)
+
 COMPUTATION_DEPTH = 2
\ No newline at end of file
@@ -1,8 +1,12 @@
-import copy
 from typing import Optional, Tuple, List
 from game import MoveValidator
 from evaluation import Evaluator
-from constants import PIECE_VALUES
+from constants import PIECE_VALUES, OPPONENT
+
+# Transposition table slots; a power of two so a hash masks to a slot
+TT_SIZE = 1 << 16
+# How a stored value relates to the true score of its position
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
 
 class ChessEngine:
     def __init__(self, board, depth):
@@ -12,39 +16,18 @@ class ChessEngine:
         self.validator = MoveValidator(board)
         self.search_depth = depth
         self.nodes_searched = 0  # For debugging
-        self.transposition_table = {}
+        # Fixed-size table of (zobrist_hash, depth, value, flag, best_move),
+        # indexed by the low bits of the hash and kept across searches.
+        # Values are from the engine's side, which never changes.
+        self.transposition_table = [None] * TT_SIZE
 
     def _snapshot_board(self):
         """Return a snapshot of pieces & mutable board state to restore after simulation."""
-        # snapshot pieces on tiles: map (q,r) -> piece or None
-        pieces_snapshot = {}
-        for coord, tile in self.board.tiles.items():
-            # store a shallow copy of piece (tuple or None)
-            pieces_snapshot[coord] = getattr(tile, "piece", None)
-        # snapshot other relevant board-level state
-        state_snapshot = {
-            "current_turn": getattr(self.board, "current_turn", None),
-            "en_passant_target": copy.deepcopy(getattr(self.board, "en_passant_target", None)),
-            "pending_promotion": copy.deepcopy(getattr(self.board, "pending_promotion", None)),
-            "captured_pieces": copy.deepcopy(getattr(self.board, "captured_pieces", {})),
-        }
-        return pieces_snapshot, state_snapshot
+        return self.board.snapshot()
 
-    def _restore_board(self, pieces_snapshot, state_snapshot):
+    def _restore_board(self, snap):
         """Restore board to a previously captured snapshot."""
-        # restore tile pieces
-        for coord, piece in pieces_snapshot.items():
-            tile = self.board.tiles.get(coord)
-            if tile is None:
-                continue
-            # assign piece directly; if tile has helper methods you can also use them
-            tile.piece = piece
-
-        # restore board state
-        self.board.current_turn = state_snapshot["current_turn"]
-        self.board.en_passant_target = copy.deepcopy(state_snapshot["en_passant_target"])
-        self.board.pending_promotion = copy.deepcopy(state_snapshot["pending_promotion"])
-        self.board.captured_pieces = copy.deepcopy(state_snapshot["captured_pieces"])
+        self.board.restore(snap)
 
 
     def _evaluate_engine_position(self) -> float:
@@ -64,19 +47,22 @@ class ChessEngine:
         Order moves to improve alpha-beta pruning efficiency.
         Priority: captures (MVV-LVA), then other moves.
         """
+        piece_at = self.board.piece_at
+        coord_to_index = self.board.coord_to_index
+
         def move_score(move):
             (from_q, from_r), (to_q, to_r) = move
             score = 0
             
             # Check if it's a capture
-            to_tile = self.board.get_tile(to_q, to_r)
-            if to_tile and to_tile.has_piece():
-                victim_color, victim_name = to_tile.get_piece()
+            victim = piece_at[coord_to_index[(to_q, to_r)]]
+            if victim is not None:
+                victim_color, victim_name = victim
                 if victim_color != current_color:
                     # MVV-LVA: Most Valuable Victim - Least Valuable Attacker
-                    from_tile = self.board.get_tile(from_q, from_r)
-                    if from_tile and from_tile.has_piece():
-                        _, attacker_name = from_tile.get_piece()
+                    attacker = piece_at[coord_to_index[(from_q, from_r)]]
+                    if attacker is not None:
+                        _, attacker_name = attacker
                         victim_value = PIECE_VALUES.get(victim_name, 0)
                         attacker_value = PIECE_VALUES.get(attacker_name, 0)
                         # Prioritize capturing high-value pieces with low-value pieces
@@ -91,15 +77,6 @@ class ChessEngine:
         # Sort moves by score (highest first)
         return sorted(moves, key=move_score, reverse=True)
 
-    def _hash_position(self) -> str:
-        """Create a simple hash of the current position."""
-        pieces = []
-        for (q, r), tile in sorted(self.board.tiles.items()):
-            if tile and tile.has_piece():
-                color, piece = tile.get_piece()
-                pieces.append(f"{q},{r},{color},{piece}")
-        return "|".join(pieces) + f"|{self.board.current_turn}"
-
     def _minimax(self, depth: int, is_maximizing: bool, alpha: float = float('-inf'), beta: float = float('inf')) -> float:
         """
         Minimax with alpha-beta pruning.
@@ -107,29 +84,34 @@ class ChessEngine:
         Returns the best evaluation score from current position.
         """
         self.nodes_searched += 1
-        # Create a simple position hash
-        position_key = self._hash_position()
-        
-        # Check transposition table
-        if position_key in self.transposition_table:
-            cached_depth, cached_value = self.transposition_table[position_key]
+        position_key = self.board.zobrist_hash
+        slot = position_key & (TT_SIZE - 1)
+
+        # Check transposition table: an exact score ends the search here,
+        # a bound narrows the window
+        tt_move = None
+        entry = self.transposition_table[slot]
+        if entry is not None and entry[0] == position_key:
+            _, cached_depth, cached_value, cached_flag, tt_move = entry
             if cached_depth >= depth:
-                return cached_value
+                if cached_flag == TT_EXACT:
+                    return cached_value
+                if cached_flag == TT_LOWER:
+                    alpha = max(alpha, cached_value)
+                else:
+                    beta = min(beta, cached_value)
+                if beta <= alpha:
+                    return cached_value
 
         # Base case: reached max depth or game over
         if depth == 0:
             return self._evaluate_engine_position()
 
-        current_turn = getattr(self.board, "current_turn", 'white')
+        current_turn = self.board.current_turn
         all_moves = []
 
         # Check if current player has any legal moves
-        for (q, r), tile in self.board.tiles.items():
-            if not tile or not tile.has_piece():
-                continue
-            piece_color, _ = tile.get_piece()
-            if piece_color != current_turn:
-                continue
+        for q, r in self.board.iter_squares(self.board.color_bitboards[current_turn]):
             moves = self.validator.get_legal_moves_with_check(q, r)
             for (to_q, to_r) in moves:
                 all_moves.append(((q, r), (to_q, to_r)))
@@ -144,55 +126,69 @@ class ChessEngine:
             return eval_score
 
         all_moves = self._order_moves(all_moves, current_turn)
+        # The best move stored for this position is searched first
+        if tt_move is not None and tt_move in all_moves:
+            all_moves.remove(tt_move)
+            all_moves.insert(0, tt_move)
 
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
         if is_maximizing:
-            max_eval = float('-inf')
-            for (from_q, from_r), (to_q, to_r) in all_moves:
-                pieces_snap, state_snap = self._snapshot_board()
+            best_eval = float('-inf')
+            for move in all_moves:
+                (from_q, from_r), (to_q, to_r) = move
+                snap = self._snapshot_board()
                 self.board.move_piece(from_q, from_r, to_q, to_r)
                 
                 # Handle promotion
-                if getattr(self.board, "pending_promotion", None):
+                if self.board.pending_promotion:
                     pq, pr, pcolor = self.board.pending_promotion
-                    prom_tile = self.board.get_tile(pq, pr)
-                    if prom_tile:
-                        prom_tile.piece = (pcolor, 'queen')
+                    self.board.place_piece(pq, pr, pcolor, 'queen')
                     self.board.pending_promotion = None
-                    self.board.current_turn = 'white' if state_snap["current_turn"] == 'black' else 'black'
+                    self.board.current_turn = OPPONENT[snap.current_turn]
 
                 eval_score = self._minimax(depth - 1, False, alpha, beta)
-                self._restore_board(pieces_snap, state_snap)
+                self._restore_board(snap)
 
-                max_eval = max(max_eval, eval_score)
+                if best_move is None or eval_score > best_eval:
+                    best_eval, best_move = eval_score, move
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
                     break # Beta cutoff
-            self.transposition_table[position_key] = (depth, max_eval)
-            return max_eval
 
         else:
-            min_eval = float('inf')
-            for (from_q, from_r), (to_q, to_r) in all_moves:
-                pieces_snap, state_snap = self._snapshot_board()
+            best_eval = float('inf')
+            for move in all_moves:
+                (from_q, from_r), (to_q, to_r) = move
+                snap = self._snapshot_board()
                 self.board.move_piece(from_q, from_r, to_q, to_r)
                 
-                if getattr(self.board, "pending_promotion", None):
+                if self.board.pending_promotion:
                     pq, pr, pcolor = self.board.pending_promotion
-                    prom_tile = self.board.get_tile(pq, pr)
-                    if prom_tile:
-                        prom_tile.piece = (pcolor, 'queen')
+                    self.board.place_piece(pq, pr, pcolor, 'queen')
                     self.board.pending_promotion = None
-                    self.board.current_turn = 'white' if state_snap["current_turn"] == 'black' else 'black'
+                    self.board.current_turn = OPPONENT[snap.current_turn]
 
                 eval_score = self._minimax(depth - 1, True, alpha, beta)
-                self._restore_board(pieces_snap, state_snap)
+                self._restore_board(snap)
 
-                min_eval = min(min_eval, eval_score)
+                if best_move is None or eval_score < best_eval:
+                    best_eval, best_move = eval_score, move
                 beta = min(beta, eval_score)
                 if beta <= alpha:
                     break # alpha cutoff
-            self.transposition_table[position_key] = (depth, min_eval)
-            return min_eval
+
+        # A score at or outside the window only bounds the true value
+        if best_eval <= alpha_orig:
+            flag = TT_UPPER
+        elif best_eval >= beta_orig:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        # Depth-preferred replacement: keep the deeper of two results
+        if entry is None or depth >= entry[1]:
+            self.transposition_table[slot] = (position_key, depth, best_eval, flag, best_move)
+        return best_eval
 
     def find_best_move(self) -> Optional[Tuple[Tuple[int,int], Tuple[int,int], float]]:
         """Search using minimax to find best move."""
@@ -202,13 +198,7 @@ class ChessEngine:
         
         # Get all legal moves for engine
         all_moves = []
-        for (q, r), tile in self.board.tiles.items():
-            if not tile or not tile.has_piece():
-                continue
-            piece_color, _ = tile.get_piece()
-            if piece_color != self.engine_color:
-                continue
-            
+        for q, r in self.board.iter_squares(self.board.color_bitboards[self.engine_color]):
             moves = self.validator.get_legal_moves_with_check(q, r)
             for (to_q, to_r) in moves:
                 all_moves.append(((q, r), (to_q, to_r)))
@@ -217,19 +207,17 @@ class ChessEngine:
         all_moves = self._order_moves(all_moves, self.engine_color)
         
         for (from_q, from_r), (to_q, to_r) in all_moves:
-            pieces_snap, state_snap = self._snapshot_board()
+            snap = self._snapshot_board()
             self.board.move_piece(from_q, from_r, to_q, to_r)
             
             if getattr(self.board, "pending_promotion", None):
                 pq, pr, pcolor = self.board.pending_promotion
-                prom_tile = self.board.get_tile(pq, pr)
-                if prom_tile:
-                    prom_tile.piece = (pcolor, 'queen')
+                self.board.place_piece(pq, pr, pcolor, 'queen')
                 self.board.pending_promotion = None
-                self.board.current_turn = 'white' if state_snap["current_turn"] == 'black' else 'black'
+                self.board.current_turn = OPPONENT[snap.current_turn]
             
             value = self._minimax(self.search_depth - 1, False)
-            self._restore_board(pieces_snap, state_snap)
+            self._restore_board(snap)
             
             if value > best_value:
                 best_value = value
@@ -259,12 +247,10 @@ class ChessEngine:
         # if pending promotion was set (move_piece doesn't finalize), auto-promote to queen
         if getattr(self.board, "pending_promotion", None):
             pq, pr, pcolor = self.board.pending_promotion
-            prom_tile = self.board.get_tile(pq, pr)
-            if prom_tile:
-                prom_tile.piece = (pcolor, 'queen')
+            self.board.place_piece(pq, pr, pcolor, 'queen')
             # clear pending_promotion and switch turn (mirror of your move_piece behavior)
             self.board.pending_promotion = None
-            self.board.current_turn = 'white' if self.board.current_turn == 'black' else 'black'
+            self.board.current_turn = OPPONENT[self.board.current_turn]
 
         # return summary information
         final_score, total_mat, phase = Evaluator.evaluate(self.board)
@@ -229,10 +229,9 @@ class Evaluator:
         """Calculate the current game phase based on remaining material."""
         phase = 0
         
-        for tile in board.tiles.values():
-            if tile and tile.has_piece():
-                color, name = tile.get_piece()
-                phase += PHASE_VALUES.get(name, 0)
+        for piece in board.piece_at:
+            if piece is not None:
+                phase += PHASE_VALUES.get(piece[1], 0)
         
         # Clamp phase to MAX_PHASE
         return min(phase, MAX_PHASE)
@@ -254,11 +253,10 @@ class Evaluator:
         # Calculate game phase first
         phase = Evaluator.calculate_phase(board)
         
-        # Iterate over all tiles
-        for tile in board.tiles.values():
-            if tile and tile.has_piece():
-                color, name = tile.get_piece()
-                q, r = tile.q, tile.r
+        # Iterate over all tiles, straight from the board's piece array
+        for (q, r), piece in zip(board.index_to_coord, board.piece_at):
+            if piece is not None:
+                color, name = piece
                 
                 # Material value
                 material_value = PIECE_VALUES.get(name, 0)
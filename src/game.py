@@ -1,304 +1,277 @@
 from typing import Tuple, List, Optional
+from constants import WHITE_PAWN_STARTS, BLACK_PAWN_STARTS, OPPONENT, PAWN_CAPTURE_DIRECTIONS
+
+# Entries kept by MoveValidator's is_in_check memo before it is reset
+CHECK_CACHE_SIZE = 4096
+
+# Order in which has_any_legal_moves probes piece types: the king first
+# (the usual escape when in check), then by decreasing mobility.
+LEGAL_MOVE_PROBE_ORDER = ("king", "queen", "rook", "bishop", "knight", "pawn")
 
 class MoveGenerator:
     """Encapsulates move-generation and attack detection for a HexBoard.
 
     Expects a board-like object with:
-      - tiles: Dict[(q,r) -> HexTile]
-      - get_tile(q,r)
-      - current_turn
+      - coord_to_index / index_to_coord and piece_at (the tile-index mailbox)
+      - piece_bitboards / color_bitboards and the precomputed move tables
+      - current_turn and en_passant_target
     """
 
     def __init__(self, board):
         self.board = board
+        # piece name -> generator, so callers dispatch with one dict lookup
+        self._movegen = {
+            "pawn": self._get_pawn_moves,
+            "knight": self._get_knight_moves,
+            "bishop": self._get_bishop_moves,
+            "rook": self._get_rook_moves,
+            "queen": self._get_queen_moves,
+            "king": self._get_king_moves,
+        }
 
     def _get_pawn_moves(self, q: int, r: int, color: str):
+        board = self.board
+        coord_to_index = board.coord_to_index
+        piece_at = board.piece_at
         moves = []
 
-        white_pawn_starts = [
-            (-4, 5), (-3, 4), (-2, 3), (-1, 2), (0, 1),
-            (1, 1), (2, 1), (3, 1), (4, 1)
-        ]
-        black_pawn_starts = [
-            (4, -5), (3, -4), (2, -3), (1, -2), (0, -1),
-            (-1, -1), (-2, -1), (-3, -1), (-4, -1)
-        ]
-
         if color == "white":
             forward_dir = (0, -1)
-            is_starting_position = (q, r) in white_pawn_starts
-            capture_dirs = [(-1, 0), (1, -1)]
+            is_starting_position = (q, r) in WHITE_PAWN_STARTS
         else:
             forward_dir = (0, 1)
-            is_starting_position = (q, r) in black_pawn_starts
-            capture_dirs = [(1, 0), (-1, 1)]
+            is_starting_position = (q, r) in BLACK_PAWN_STARTS
+        capture_dirs = PAWN_CAPTURE_DIRECTIONS[color]
 
         nq, nr = q + forward_dir[0], r + forward_dir[1]
-        target = self.board.get_tile(nq, nr)
-        if target and not target.has_piece():
+        idx = coord_to_index.get((nq, nr))
+        if idx is not None and piece_at[idx] is None:
             moves.append((nq, nr))
             if is_starting_position:
                 nq2, nr2 = q + forward_dir[0] * 2, r + forward_dir[1] * 2
-                target2 = self.board.get_tile(nq2, nr2)
-                if target2 and not target2.has_piece():
+                idx2 = coord_to_index.get((nq2, nr2))
+                if idx2 is not None and piece_at[idx2] is None:
                     moves.append((nq2, nr2))
 
         for dq, dr in capture_dirs:
             nq, nr = q + dq, r + dr
-            target = self.board.get_tile(nq, nr)
-            if target and target.has_piece():
-                enemy_color, _ = target.get_piece()
-                if enemy_color != color:
+            idx = coord_to_index.get((nq, nr))
+            if idx is not None:
+                target = piece_at[idx]
+                if target is not None and target[0] != color:
                     moves.append((nq, nr))
-        if self.board.en_passant_target:
+        if board.en_passant_target:
             for dq, dr in capture_dirs:
                 nq, nr = q + dq, r + dr
-                if (nq, nr) == self.board.en_passant_target:
+                if (nq, nr) == board.en_passant_target:
                     moves.append((nq, nr))
         return moves
 
-    def _get_knight_moves(self, q: int, r: int, color: str):
-        moves = []
-        orthogonal_dirs = [
-            (1, 0), (-1, 0),
-            (0, 1), (0, -1),
-            (1, -1), (-1, 1)
-        ]
-        for dq, dr in orthogonal_dirs:
-            mid_q, mid_r = q + 2*dq, r + 2*dr
-
-            if (dq, dr) == (1, 0):
-                perpendicular = [(0, 1), (1, -1)]
-            elif (dq, dr) == (-1, 0):
-                perpendicular = [(0, -1), (-1, 1)]
-            elif (dq, dr) == (0, 1):
-                perpendicular = [(-1, 1), (1, 0)]
-            elif (dq, dr) == (0, -1):
-                perpendicular = [(1, -1), (-1, 0)]
-            elif (dq, dr) == (1, -1):
-                perpendicular = [(1, 0), (0, -1)]
-            else:
-                perpendicular = [(-1, 0), (0, 1)]
+    def _get_jump_moves(self, q: int, r: int, color: str, attacks):
+        board = self.board
+        idx = board.coord_to_index.get((q, r))
+        if idx is None:
+            return []
+        return list(board.iter_squares(attacks[idx] & ~board.color_bitboards[color]))
 
-            for pq, pr in perpendicular:
-                nq, nr = mid_q + pq, mid_r + pr
-                target = self.board.get_tile(nq, nr)
-                if target:
-                    if not target.has_piece():
-                        moves.append((nq, nr))
-                    else:
-                        enemy_color, _ = target.get_piece()
-                        if enemy_color != color:
-                            moves.append((nq, nr))
-        return moves
+    def _get_knight_moves(self, q: int, r: int, color: str):
+        return self._get_jump_moves(q, r, color, self.board.knight_attacks)
 
-    def _get_sliding_moves(self, q: int, r: int, color: str, directions):
-        moves = []
-        for dq, dr in directions:
-            nq, nr = q + dq, r + dr
-            while (nq, nr) in self.board.tiles:
-                target = self.board.get_tile(nq, nr)
-                if not target.has_piece():
-                    moves.append((nq, nr))
+    def _get_slider_targets(self, idx: int, color: str, ray_masks) -> int:
+        """Bitboard of squares a slider on idx reaches along the given rays."""
+        board = self.board
+        own = board.color_bitboards[color]
+        occupied = own | board.color_bitboards[OPPONENT[color]]
+        targets = 0
+        for mask, ascending in ray_masks[idx]:
+            blockers = mask & occupied
+            if blockers:
+                # Cut the ray at the nearest piece, keeping that square
+                # only if it holds an enemy piece
+                if ascending:
+                    nearest = blockers & -blockers
+                    mask &= (nearest << 1) - 1
                 else:
-                    enemy_color, _ = target.get_piece()
-                    if enemy_color != color:
-                        moves.append((nq, nr))
-                    break
-                nq += dq
-                nr += dr
-        return moves
+                    nearest = 1 << (blockers.bit_length() - 1)
+                    mask &= ~(nearest - 1)
+                if nearest & own:
+                    mask ^= nearest
+            targets |= mask
+        return targets
+
+    def _get_slider_moves(self, q: int, r: int, color: str, *ray_tables):
+        board = self.board
+        idx = board.coord_to_index.get((q, r))
+        if idx is None:
+            return []
+        targets = 0
+        for ray_masks in ray_tables:
+            targets |= self._get_slider_targets(idx, color, ray_masks)
+        return list(board.iter_squares(targets))
 
     def _get_bishop_moves(self, q: int, r: int, color: str):
-        moves = []
-        current_tile = self.board.get_tile(q, r)
-        if not current_tile:
-            return moves
-        target_color = current_tile.color
-        diagonal_dirs = [
-            (1, 1), (-1, -1),
-            (2, -1), (-2, 1),
-            (1, -2), (-1, 2)
-        ]
-        for dq, dr in diagonal_dirs:
-            nq, nr = q + dq, r + dr
-            while (nq, nr) in self.board.tiles:
-                target = self.board.get_tile(nq, nr)
-                if target.color != target_color:
-                    break
-                if not target.has_piece():
-                    moves.append((nq, nr))
-                else:
-                    enemy_color, _ = target.get_piece()
-                    if enemy_color != color:
-                        moves.append((nq, nr))
-                    break
-                nq += dq
-                nr += dr
-        return moves
+        return self._get_slider_moves(q, r, color, self.board.diagonal_ray_masks)
 
     def _get_rook_moves(self, q: int, r: int, color: str):
-        orthogonal_dirs = [
-            (1, 0), (-1, 0),
-            (0, 1), (0, -1),
-            (1, -1), (-1, 1)
-        ]
-        return self._get_sliding_moves(q, r, color, orthogonal_dirs)
+        return self._get_slider_moves(q, r, color, self.board.orthogonal_ray_masks)
 
     def _get_queen_moves(self, q: int, r: int, color: str):
-        rook_moves = self._get_rook_moves(q, r, color)
-        bishop_moves = self._get_bishop_moves(q, r, color)
-        return list(set(rook_moves + bishop_moves))
+        return self._get_slider_moves(q, r, color, self.board.orthogonal_ray_masks,
+                                      self.board.diagonal_ray_masks)
 
     def _get_king_moves(self, q: int, r: int, color: str):
-        moves = []
-        current_tile = self.board.get_tile(q, r)
-        if not current_tile:
-            return moves
-        target_color = current_tile.color
-        orthogonal_dirs = [
-            (1, 0), (-1, 0),
-            (0, 1), (0, -1),
-            (1, -1), (-1, 1)
-        ]
-        diagonal_dirs = [
-            (1, 1), (-1, -1),
-            (2, -1), (-2, 1),
-            (1, -2), (-1, 2)
-        ]
-        for dq, dr in orthogonal_dirs:
-            nq, nr = q + dq, r + dr
-            target = self.board.get_tile(nq, nr)
-            if target:
-                if not target.has_piece():
-                    moves.append((nq, nr))
-                else:
-                    enemy_color, _ = target.get_piece()
-                    if enemy_color != color:
-                        moves.append((nq, nr))
-        for dq, dr in diagonal_dirs:
-            nq, nr = q + dq, r + dr
-            target = self.board.get_tile(nq, nr)
-            if target and target.color == target_color:
-                if not target.has_piece():
-                    moves.append((nq, nr))
-                else:
-                    enemy_color, _ = target.get_piece()
-                    if enemy_color != color:
-                        moves.append((nq, nr))
-        return moves
+        return self._get_jump_moves(q, r, color, self.board.king_attacks)
+
+    def get_move_mask(self, q: int, r: int, color: str, piece_name: str) -> int:
+        """Bitboard of the pseudo-legal destinations of a piece on (q, r)."""
+        board = self.board
+        idx = board.coord_to_index.get((q, r))
+        if idx is None:
+            return 0
+        if piece_name == "knight":
+            return board.knight_attacks[idx] & ~board.color_bitboards[color]
+        if piece_name == "king":
+            return board.king_attacks[idx] & ~board.color_bitboards[color]
+        if piece_name == "bishop":
+            return self._get_slider_targets(idx, color, board.diagonal_ray_masks)
+        if piece_name == "rook":
+            return self._get_slider_targets(idx, color, board.orthogonal_ray_masks)
+        if piece_name == "queen":
+            return (self._get_slider_targets(idx, color, board.orthogonal_ray_masks)
+                    | self._get_slider_targets(idx, color, board.diagonal_ray_masks))
+        # Pawn pushes, captures and en passant don't reduce to one table
+        mask = 0
+        if piece_name == "pawn":
+            for coord in self._get_pawn_moves(q, r, color):
+                mask |= 1 << board.coord_to_index[coord]
+        return mask
 
 class MoveValidator:
     def __init__(self, board):
         self.board = board
         self.move_generator = MoveGenerator(board)
+        # (zobrist_hash, color) -> is_in_check result
+        self._check_cache = {}
+        # (zobrist_hash, color, pinned bitboard) for the last pin query
+        self._pins = (None, None, 0)
 
     def get_legal_moves(self, q: int, r: int) -> List[Tuple[int, int]]:
-        tile = self.board.get_tile(q, r)
-        if not tile or not tile.has_piece():
+        idx = self.board.coord_to_index.get((q, r))
+        if idx is None or self.board.piece_at[idx] is None:
             return []
 
-        piece_color, piece_name = tile.get_piece()
+        piece_color, piece_name = self.board.piece_at[idx]
 
         # Only show legal moves if it's this piece's turn
         if piece_color != self.board.current_turn:
             return []
 
-        if piece_name == "pawn":
-            return self.move_generator._get_pawn_moves(q, r, piece_color)
-        elif piece_name == "knight":
-            return self.move_generator._get_knight_moves(q, r, piece_color)
-        elif piece_name == "bishop":
-            return self.move_generator._get_bishop_moves(q, r, piece_color)
-        elif piece_name == "rook":
-            return self.move_generator._get_rook_moves(q, r, piece_color)
-        elif piece_name == "queen":
-            return self.move_generator._get_queen_moves(q, r, piece_color)
-        elif piece_name == "king":
-            return self.move_generator._get_king_moves(q, r, piece_color)
-
-        return []
+        generator = self.move_generator._movegen.get(piece_name)
+        if generator is None:
+            return []
+        return generator(q, r, piece_color)
     
     def is_square_attacked(self, q: int, r: int, by_color: str) -> bool:
-        for (pq, pr), tile in self.board.tiles.items():
-            if not tile.has_piece():
-                continue
-            piece_color, piece_name = tile.get_piece()
-            if piece_color != by_color:
+        board = self.board
+        pieces = board.piece_bitboards
+        idx = board.coord_to_index[(q, r)]
+
+        # Knights, kings and pawns attack from fixed squares: one AND each
+        if board.knight_attacks[idx] & pieces[(by_color, "knight")]:
+            return True
+        if board.king_attacks[idx] & pieces[(by_color, "king")]:
+            return True
+        if board.pawn_attackers[by_color][idx] & pieces[(by_color, "pawn")]:
+            return True
+
+        # Sliders: only the nearest occupied square on each ray can attack.
+        occupied = board.color_bitboards["white"] | board.color_bitboards["black"]
+        queens = pieces[(by_color, "queen")]
+        for reach, ray_masks, sliders in (
+                (board.orthogonal_reach, board.orthogonal_ray_masks, pieces[(by_color, "rook")] | queens),
+                (board.diagonal_reach, board.diagonal_ray_masks, pieces[(by_color, "bishop")] | queens)):
+            if not reach[idx] & sliders:
                 continue
-            if piece_name == "pawn":
-                if piece_color == "white":
-                    capture_dirs = [(-1, 0), (1, -1)]
-                else:
-                    capture_dirs = [(1, 0), (-1, 1)]
-                for dq, dr in capture_dirs:
-                    if (pq + dq, pr + dr) == (q, r):
+            for mask, ascending in ray_masks[idx]:
+                blockers = mask & occupied
+                if blockers:
+                    nearest = blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+                    if nearest & sliders:
                         return True
-            else:
-                if piece_name == "knight":
-                    moves = self.move_generator._get_knight_moves(pq, pr, piece_color)
-                elif piece_name == "bishop":
-                    moves = self.move_generator._get_bishop_moves(pq, pr, piece_color)
-                elif piece_name == "rook":
-                    moves = self.move_generator._get_rook_moves(pq, pr, piece_color)
-                elif piece_name == "queen":
-                    moves = self.move_generator._get_queen_moves(pq, pr, piece_color)
-                elif piece_name == "king":
-                    moves = self.move_generator._get_king_moves(pq, pr, piece_color)
-                else:
-                    moves = []
-                if (q, r) in moves:
-                    return True
-        return False  
+        return False
     
     def find_king(self, color: str) -> Optional[Tuple[int, int]]:
         """Find the position of a king of the given color."""
-        for (q, r), tile in self.board.tiles.items():
-            if tile.has_piece():
-                piece_color, piece_name = tile.get_piece()
-                if piece_color == color and piece_name == "king":
-                    return (q, r)
-        return None
+        king_bb = self.board.piece_bitboards[(color, "king")]
+        if not king_bb:
+            return None
+        # Lowest set bit -> tile index
+        return self.board.index_to_coord[(king_bb & -king_bb).bit_length() - 1]
     
     def is_in_check(self, color: str) -> bool:
         """Check if the king of the given color is in check."""
+        key = (self.board.zobrist_hash, color)
+        cached = self._check_cache.get(key)
+        if cached is not None:
+            return cached
+
         king_pos = self.find_king(color)
         if not king_pos:
-            return False
-        
-        enemy_color = "black" if color == "white" else "white"
-        return self.is_square_attacked(king_pos[0], king_pos[1], enemy_color)
+            in_check = False
+        else:
+            in_check = self.is_square_attacked(king_pos[0], king_pos[1], OPPONENT[color])
+
+        if len(self._check_cache) >= CHECK_CACHE_SIZE:
+            self._check_cache.clear()
+        self._check_cache[key] = in_check
+        return in_check
+
+    def pinned_pieces(self, color: str) -> int:
+        """Pinned-piece bitboard for color, reused until the position changes."""
+        zobrist_hash = self.board.zobrist_hash
+        cached_hash, cached_color, pinned = self._pins
+        if cached_hash != zobrist_hash or cached_color != color:
+            pinned = self.board.compute_pins(color)
+            self._pins = (zobrist_hash, color, pinned)
+        return pinned
+
+    def _needs_simulation(self, q: int, r: int) -> bool:
+        """Whether moves of the piece on (q, r) can expose its own king.
+
+        Outside check, only king moves and moves by pinned pieces can; a
+        free piece's pseudo-legal moves are all legal.
+        """
+        idx = self.board.coord_to_index[(q, r)]
+        color, piece_name = self.board.piece_at[idx]
+        if piece_name == "king" or self.is_in_check(color):
+            return True
+        return bool(self.pinned_pieces(color) >> idx & 1)
     
     def simulate_move(self, from_q: int, from_r: int, to_q: int, to_r: int) -> bool:
         """Simulate a move and check if it leaves the king in check.
         Returns True if the move is valid (doesn't leave king in check)."""
-        from_tile = self.board.get_tile(from_q, from_r)  # Fixed: use self.board
-        to_tile = self.board.get_tile(to_q, to_r)        # Fixed: use self.board
-        
-        if not from_tile or not to_tile or not from_tile.has_piece():
+        coord_to_index = self.board.coord_to_index
+        from_idx = coord_to_index.get((from_q, from_r))
+        if from_idx is None or (to_q, to_r) not in coord_to_index:
+            return False
+        moving_piece = self.board.piece_at[from_idx]
+        if moving_piece is None:
             return False
         
-        # Save the state
-        moving_piece = from_tile.piece
-        captured_piece = to_tile.piece
-        piece_color, _ = moving_piece
-        
-        # Make the move temporarily
-        to_tile.piece = moving_piece
-        from_tile.piece = None
+        piece_color = moving_piece[0]
         
-        # Check if king is in check
+        # Make the move temporarily, check, then take it back
+        captured_piece = self.board.make_raw_move(from_q, from_r, to_q, to_r)
         in_check = self.is_in_check(piece_color)
-        
-        # Restore the state
-        from_tile.piece = moving_piece
-        to_tile.piece = captured_piece
+        self.board.unmake_raw_move(from_q, from_r, to_q, to_r, captured_piece)
         
         return not in_check
     
     def get_legal_moves_with_check(self, q: int, r: int) -> list:
         """Get legal moves that don't leave the king in check."""
         raw_moves = self.get_legal_moves(q, r)
+        if not raw_moves or not self._needs_simulation(q, r):
+            return raw_moves
         legal_moves = []
         
         for move_q, move_r in raw_moves:
@@ -307,20 +280,39 @@ class MoveValidator:
         
         return legal_moves
     
+    def get_legal_move_mask(self, q: int, r: int) -> int:
+        """Bitboard of the destinations get_legal_moves_with_check returns."""
+        board = self.board
+        idx = board.coord_to_index.get((q, r))
+        if idx is None or board.piece_at[idx] is None:
+            return 0
+        piece_color, piece_name = board.piece_at[idx]
+        if piece_color != board.current_turn:
+            return 0
+
+        mask = self.move_generator.get_move_mask(q, r, piece_color, piece_name)
+        if not mask or not self._needs_simulation(q, r):
+            return mask
+        for move_q, move_r in list(board.iter_squares(mask)):
+            if not self.simulate_move(q, r, move_q, move_r):
+                mask ^= 1 << board.coord_to_index[(move_q, move_r)]
+        return mask
+    
     def has_any_legal_moves(self, color: str) -> bool:
         """Check if a color has any legal moves."""
-        for (q, r), tile in self.board.tiles.items():  # Fixed: use self.board.tiles
-            if not tile.has_piece():
-                continue
-            
-            piece_color, _ = tile.get_piece()
-            if piece_color != color:
-                continue
-            
-            # Check if this piece has any legal moves
-            moves = self.get_legal_moves_with_check(q, r)
-            if moves:
-                return True
+        board = self.board
+        # Walk the piece-type bitboards in probe order and stop at the
+        # first move that does not leave the king in check.
+        for piece_name in LEGAL_MOVE_PROBE_ORDER:
+            for q, r in board.iter_squares(board.piece_bitboards[(color, piece_name)]):
+                raw_moves = self.get_legal_moves(q, r)
+                if not raw_moves:
+                    continue
+                if not self._needs_simulation(q, r):
+                    return True
+                for move_q, move_r in raw_moves:
+                    if self.simulate_move(q, r, move_q, move_r):
+                        return True
         
         return False
     
@@ -338,13 +330,12 @@ class MoveValidator:
         """
         current_color = self.board.current_turn
         
-        if self.is_checkmate(current_color):
-            return 'checkmate'
-        
-        if self.is_stalemate(current_color):
-            return 'stalemate'
+        # Each is computed once; is_checkmate/is_stalemate would repeat them
+        in_check = self.is_in_check(current_color)
+        if not self.has_any_legal_moves(current_color):
+            return 'checkmate' if in_check else 'stalemate'
         
-        if self.is_in_check(current_color):
+        if in_check:
             return 'check'
         
         # TODO: Add draw by repetition, 50-move rule, insufficient material
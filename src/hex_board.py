@@ -1,17 +1,73 @@
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List, NamedTuple
 import math
+import random
+from array import array
+from collections import Counter
 from constants import *
 from game import MoveGenerator
 
+# Unit-circle corner directions of a flat-topped hexagon (0°, 60°, ... 300°)
+_HEX_UNIT_CORNERS = tuple(
+    (math.cos(math.pi / 180 * (60 * i)), math.sin(math.pi / 180 * (60 * i))) for i in range(6)
+)
+
+
+def hex_corners(center_x: float, center_y: float, radius: float) -> List[Tuple[float, float]]:
+    """The six corner points of a flat-topped hexagon, without any trigonometry."""
+    return [(center_x + radius * ux, center_y + radius * uy) for ux, uy in _HEX_UNIT_CORNERS]
+
+
+_SQRT3 = math.sqrt(3)
+_SQRT3_OVER_2 = _SQRT3 / 2
+_SQRT3_OVER_3 = _SQRT3 / 3
+
+# Pixel lookup table entries: not yet computed / off the board; anything
+# else is tile index + 1
+_LUT_UNKNOWN = 0
+_LUT_OFF_BOARD = 0xFFFF
+
+# Fixed seed so position hashes are reproducible between runs
+_ZOBRIST_SEED = 0x6E5C4E55
+
+def _iter_bits(bb: int):
+    """Yield the index of each set bit, lowest first."""
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
 class HexTile:
-    """Represents a single hexagonal tile."""
-    
-    def __init__(self, q: int, r: int, color: Tuple[int, int, int]):
+    """Represents a single hexagonal tile.
+
+    Piece contents live in the owning board's piece_at array; piece here
+    is a view onto that slot, and writing it goes through the board so the
+    bitboards stay in step.
+    """
+
+    __slots__ = ("q", "r", "index", "color_index", "pixel_pos", "_board")
+
+    def __init__(self, board: "HexBoard", index: int, q: int, r: int, color_index: int = 0):
         self.q = q
         self.r = r
-        self.color = color
-        self.piece = None  # Will hold (color, piece_name) tuple
+        self.index = index
+        self.color_index = color_index  # 0-2 shade; HEX_PALETTE gives the fill
         self.pixel_pos = None  # Will be set during rendering
+        self._board = board
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        """RGB fill of this tile."""
+        return HEX_PALETTE[self.color_index]
+
+    @property
+    def piece(self) -> Optional[Tuple[str, str]]:
+        """(color, piece_name) on this tile, or None."""
+        return self._board.piece_at[self.index]
+
+    @piece.setter
+    def piece(self, piece: Optional[Tuple[str, str]]):
+        self._board._set_piece_at((self.q, self.r), piece)
         
     def set_piece(self, color: str, piece_name: str):
         """Place a piece on this tile."""
@@ -30,19 +86,94 @@ class HexTile:
         return self.piece
 
 
+class BoardSnapshot(NamedTuple):
+    """Everything HexBoard.restore needs to put a position back."""
+    piece_at: Tuple[Optional[Tuple[str, str]], ...]
+    piece_bitboards: Dict[Tuple[str, str], int]
+    color_bitboards: Dict[str, int]
+    zobrist_hash: int
+    current_turn: str
+    en_passant_target: Optional[Tuple[int, int]]
+    pending_promotion: Optional[Tuple[int, int, str]]
+    captured_pieces: Dict[str, Counter]
+
+
+class MoveRecord(NamedTuple):
+    """What HexBoard.move_piece changed, for HexBoard.unmake_move."""
+    from_q: int
+    from_r: int
+    to_q: int
+    to_r: int
+    moved_piece: Tuple[str, str]
+    captured_piece: Optional[Tuple[str, str]]
+    # (coord, pawn) taken en passant, if any
+    en_passant_capture: Optional[Tuple[Tuple[int, int], Tuple[str, str]]]
+    prev_en_passant: Optional[Tuple[int, int]]
+    prev_turn: str
+    prev_pending_promotion: Optional[Tuple[int, int, str]]
+
+
 class HexBoard:
     """Represents a hexagonal chess board using axial coordinates."""
+
+    __slots__ = (
+        "size", "radius", "tiles", "_current_turn", "flipped", "flip_sign",
+        "_en_passant_target", "pending_promotion", "captured_pieces",
+        "_corner_offsets", "_pixel_lut", "_pixel_lut_geometry", "pixel_offsets",
+        "coord_to_index", "index_to_coord", "piece_at",
+        "orthogonal_rays", "diagonal_rays", "knight_targets", "king_targets", "neighbors",
+        "neighbor_bitboards", "knight_attacks", "king_attacks",
+        "orthogonal_ray_masks", "diagonal_ray_masks", "orthogonal_reach", "diagonal_reach",
+        "pawn_attackers", "pawn_start_masks", "promotion_masks",
+        "piece_bitboards", "color_bitboards", "zobrist_keys", "zobrist_side",
+        "zobrist_en_passant", "zobrist_hash",
+        "move_generator",
+    )
     
     def __init__(self, size: int, hex_radius: float):
         self.size = size
         self.radius = hex_radius
         self.tiles: Dict[Tuple[int, int], HexTile] = {}
-        self.current_turn = "white"  # Track whose turn it is
+        # Side to move and en-passant square; set through the current_turn
+        # and en_passant_target properties, which keep zobrist_hash in step
+        self._current_turn = "white"
         self.flipped = False
-        self.en_passant_target = None
+        # -1 while flipped: multiplying (q, r) maps board and screen coordinates
+        self.flip_sign = 1
+        self._en_passant_target = None
         self.pending_promotion = None
-        self.captured_pieces = {"white": [], "black": []}
+        # color -> Counter of captured piece names
+        self.captured_pieces = {"white": Counter(), "black": Counter()}
+        # Corner offsets from a tile center, fixed for this radius
+        self._corner_offsets = tuple((hex_radius * ux, hex_radius * uy) for ux, uy in _HEX_UNIT_CORNERS)
+        # Per-pixel hit-test table for one window layout; see build_pixel_lut
+        self._pixel_lut = array("H")
+        self._pixel_lut_geometry = (0, 0, None, None)
+        self.coord_to_index: Dict[Tuple[int, int], int] = {}
+        self.index_to_coord: Tuple[Tuple[int, int], ...] = ()
+        self.pixel_offsets: Dict[Tuple[int, int], Tuple[float, float]] = {}
         self._generate_tiles()
+        # Piece on each tile, by tile index: the board's mailbox. HexTile.piece
+        # reads from here.
+        self.piece_at: List[Optional[Tuple[str, str]]] = [None] * len(self.index_to_coord)
+        self._build_move_tables()
+        # One bit per tile index, per (color, piece_name) and per color.
+        # Kept in step with piece_at by _set_piece_at.
+        self.piece_bitboards: Dict[Tuple[str, str], int] = {
+            (color, name): 0 for color in ("white", "black") for name in PIECE_VALUES
+        }
+        self.color_bitboards: Dict[str, int] = {"white": 0, "black": 0}
+        # Zobrist keys per (color, piece_name) and tile index, one for black
+        # to move and one per en-passant square. zobrist_hash is the XOR of
+        # the keys of every occupied square and of the side/en-passant state.
+        rng = random.Random(_ZOBRIST_SEED)
+        self.zobrist_keys: Dict[Tuple[str, str], Tuple[int, ...]] = {
+            key: tuple(rng.getrandbits(64) for _ in self.index_to_coord)
+            for key in self.piece_bitboards
+        }
+        self.zobrist_side = rng.getrandbits(64)
+        self.zobrist_en_passant: Tuple[int, ...] = tuple(rng.getrandbits(64) for _ in self.index_to_coord)
+        self.zobrist_hash = 0
         self.move_generator = MoveGenerator(self)
         
     def _generate_tiles(self):
@@ -51,33 +182,180 @@ class HexBoard:
             r1 = max(-self.size + 1, -q - self.size + 1)
             r2 = min(self.size - 1, -q + self.size - 1)
             for r in range(r1, r2 + 1):
-                color = self._get_hex_color(q, r)
-                self.tiles[(q, r)] = HexTile(q, r, color)
+                self.tiles[(q, r)] = HexTile(self, len(self.tiles), q, r, (q - r) % 3)
+        self.index_to_coord = tuple(self.tiles)
+        self.coord_to_index = {coord: i for i, coord in enumerate(self.index_to_coord)}
+        # The radius is fixed, so every tile's offset from the board center is too
+        self.pixel_offsets = {coord: self._pixel_offset(*coord) for coord in self.index_to_coord}
     
-    def _get_hex_color(self, q: int, r: int) -> Tuple[int, int, int]:
+    def _build_move_tables(self):
+        """Precompute per-tile move geometry for this board size.
+
+        orthogonal_rays[(q, r)] / diagonal_rays[(q, r)] hold six tuples of
+        coordinates ordered outward from the tile, stopping at the board edge.
+        Diagonal steps never change a tile's shade, so bishop rays need no
+        color check. knight_targets[(q, r)] lists the on-board knight jumps,
+        king_targets[(q, r)] the on-board king steps, and neighbors[(q, r)]
+        the adjacent tiles in get_neighbors order. neighbor_bitboards[idx] is
+        the same neighbor set as a bitboard, indexed by tile index;
+        knight_attacks[idx] and king_attacks[idx] do the same for the knight
+        and king targets.
+        """
+        self.orthogonal_rays = {}
+        self.diagonal_rays = {}
+        self.knight_targets = {}
+        self.king_targets = {}
+        self.neighbors = {}
+        neighbor_dirs = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+        for (q, r) in self.tiles:
+            self.neighbors[(q, r)] = tuple(
+                (q + dq, r + dr) for dq, dr in neighbor_dirs if (q + dq, r + dr) in self.tiles
+            )
+            self.knight_targets[(q, r)] = tuple(
+                (q + dq, r + dr) for dq, dr in KNIGHT_OFFSETS if (q + dq, r + dr) in self.tiles
+            )
+            for rays, directions in ((self.orthogonal_rays, ORTHOGONAL_DIRECTIONS),
+                                     (self.diagonal_rays, DIAGONAL_DIRECTIONS)):
+                tile_rays = []
+                for dq, dr in directions:
+                    ray = []
+                    nq, nr = q + dq, r + dr
+                    while (nq, nr) in self.tiles:
+                        ray.append((nq, nr))
+                        nq += dq
+                        nr += dr
+                    tile_rays.append(tuple(ray))
+                rays[(q, r)] = tuple(tile_rays)
+            # A king steps one square along every orthogonal and diagonal ray
+            self.king_targets[(q, r)] = tuple(
+                ray[0] for ray in self.orthogonal_rays[(q, r)] + self.diagonal_rays[(q, r)] if ray
+            )
+
+        coord_to_index = self.coord_to_index
+        self.neighbor_bitboards = tuple(
+            sum(1 << coord_to_index[n] for n in self.neighbors[coord])
+            for coord in self.index_to_coord
+        )
+        self.knight_attacks = tuple(
+            sum(1 << coord_to_index[t] for t in self.knight_targets[coord])
+            for coord in self.index_to_coord
+        )
+        self.king_attacks = tuple(
+            sum(1 << coord_to_index[t] for t in self.king_targets[coord])
+            for coord in self.index_to_coord
+        )
+
+        # Ray masks for bitboard slider tests. Tile indices follow sorted
+        # (q, r), so they strictly increase or decrease along any ray; the
+        # flag says which, and so whether the nearest blocker is the lowest
+        # or the highest set bit.
+        def ray_masks(rays_by_tile, directions):
+            masks = []
+            for coord in self.index_to_coord:
+                masks.append(tuple(
+                    (sum(1 << coord_to_index[c] for c in ray), (dq, dr) > (0, 0))
+                    for ray, (dq, dr) in zip(rays_by_tile[coord], directions) if ray
+                ))
+            return tuple(masks)
+
+        self.orthogonal_ray_masks = ray_masks(self.orthogonal_rays, ORTHOGONAL_DIRECTIONS)
+        self.diagonal_ray_masks = ray_masks(self.diagonal_rays, DIAGONAL_DIRECTIONS)
+        self.orthogonal_reach = tuple(
+            sum(mask for mask, _ in tile_masks) for tile_masks in self.orthogonal_ray_masks
+        )
+        self.diagonal_reach = tuple(
+            sum(mask for mask, _ in tile_masks) for tile_masks in self.diagonal_ray_masks
+        )
+        # pawn_attackers[color][idx]: squares from which a pawn of that
+        # color would capture onto idx
+        self.pawn_attackers = {
+            color: tuple(
+                sum(1 << coord_to_index[(q - dq, r - dr)]
+                    for dq, dr in PAWN_CAPTURE_DIRECTIONS[color]
+                    if (q - dq, r - dr) in coord_to_index)
+                for (q, r) in self.index_to_coord
+            )
+            for color in PAWN_CAPTURE_DIRECTIONS
+        }
+        # Pawn start and promotion squares as masks, for whole-board tests
+        # such as piece_bitboards[(color, "pawn")] & promotion_masks[color].
+        # Single-square checks keep using the frozensets: the index lookup
+        # they would need costs as much as the set lookup itself.
+        self.pawn_start_masks = {
+            "white": sum(1 << coord_to_index[c] for c in WHITE_PAWN_STARTS),
+            "black": sum(1 << coord_to_index[c] for c in BLACK_PAWN_STARTS),
+        }
+        self.promotion_masks = {
+            color: sum(1 << coord_to_index[c] for c in squares)
+            for color, squares in PROMOTION_SQUARES.items()
+        }
+
+    def _get_hex_color_index(self, q: int, r: int) -> int:
         """
-        Determine hex color using 3-coloring algorithm.
+        Determine hex shade using 3-coloring algorithm.
         For hexagonal grids, we can use: (q - r) mod 3
         This ensures no two adjacent hexagons have the same color.
         """
-        color_index = (q - r) % 3
-        colors = [GREY, WHITE, BLACK]
-        return colors[color_index]
+        return (q - r) % 3
+
+    def _get_hex_color(self, q: int, r: int) -> Tuple[int, int, int]:
+        """Determine the RGB fill color of a hex."""
+        return HEX_PALETTE[self._get_hex_color_index(q, r)]
     
+    def _pixel_offset(self, q: int, r: int) -> Tuple[float, float]:
+        """Pixel offset of a hex center from the board center."""
+        return self.radius * (1.5 * q), self.radius * (_SQRT3_OVER_2 * q + _SQRT3 * r)
+
     def axial_to_pixel(self, q: int, r: int, center_x: float, center_y: float) -> Tuple[float, float]:
         """Convert axial coordinates to pixel coordinates."""
-        x = center_x + self.radius * (3/2 * q)
-        y = center_y + self.radius * (math.sqrt(3)/2 * q + math.sqrt(3) * r)
-        return x, y
+        offset = self.pixel_offsets.get((q, r))
+        if offset is None:
+            offset = self._pixel_offset(q, r)
+        return center_x + offset[0], center_y + offset[1]
+
+    @staticmethod
+    def pixel_bounds(size: int, radius: float) -> Tuple[float, float]:
+        """Pixel width and height a board of this size and radius needs."""
+        xs = []
+        ys = []
+        for q in range(-size + 1, size):
+            r1 = max(-size + 1, -q - size + 1)
+            r2 = min(size - 1, -q + size - 1)
+            for r in range(r1, r2 + 1):
+                xs.append(radius * (1.5 * q))
+                ys.append(radius * (_SQRT3_OVER_2 * q + _SQRT3 * r))
+        return (max(xs) - min(xs)) + 2 * radius, (max(ys) - min(ys)) + 2 * radius
     
+    def build_pixel_lut(self, width: int, height: int, center_x: int, center_y: int):
+        """Set up a per-pixel tile lookup for a fixed window layout.
+
+        Entries are filled on first query with the exact pixel_to_axial
+        result, so each pixel pays for the hex math once and never again.
+        """
+        self._pixel_lut = array("H", [_LUT_UNKNOWN]) * (width * height)
+        self._pixel_lut_geometry = (width, height, center_x, center_y)
+
     def pixel_to_axial(self, x: float, y: float, center_x: float, center_y: float) -> Optional[Tuple[int, int]]:
         """Convert pixel coordinates to axial coordinates."""
+        width, height, lut_center_x, lut_center_y = self._pixel_lut_geometry
+        if (center_x == lut_center_x and center_y == lut_center_y
+                and type(x) is int and type(y) is int and 0 <= x < width and 0 <= y < height):
+            slot = y * width + x
+            entry = self._pixel_lut[slot]
+            if entry == _LUT_UNKNOWN:
+                coord = self._compute_pixel_to_axial(x, y, center_x, center_y)
+                self._pixel_lut[slot] = _LUT_OFF_BOARD if coord is None else self.coord_to_index[coord] + 1
+                return coord
+            return None if entry == _LUT_OFF_BOARD else self.index_to_coord[entry - 1]
+        return self._compute_pixel_to_axial(x, y, center_x, center_y)
+
+    def _compute_pixel_to_axial(self, x: float, y: float, center_x: float, center_y: float) -> Optional[Tuple[int, int]]:
         # Convert to fractional axial coordinates
         x_rel = x - center_x
         y_rel = y - center_y
         
         q = (2.0/3.0 * x_rel) / self.radius
-        r = (-1.0/3.0 * x_rel + math.sqrt(3)/3 * y_rel) / self.radius
+        r = (-1.0/3.0 * x_rel + _SQRT3_OVER_3 * y_rel) / self.radius
         
         # Round to nearest hex
         return self._axial_round(q, r)
@@ -94,46 +372,226 @@ class HexBoard:
         r_diff = abs(r_int - r)
         s_diff = abs(s_int - s)
         
+        # Plain branches on purpose: in CPython a mask-and-multiply
+        # "branchless" select runs slower than two comparisons.
         if q_diff > r_diff and q_diff > s_diff:
             q_int = -r_int - s_int
         elif r_diff > s_diff:
             r_int = -q_int - s_int
         
         # Check if this coordinate is on the board
-        if (q_int, r_int) in self.tiles:
-            return (q_int, r_int)
-        return None
+        coord = (q_int, r_int)
+        return coord if coord in self.tiles else None
     
     def get_tile(self, q: int, r: int) -> Optional[HexTile]:
         """Get tile at given axial coordinates."""
         return self.tiles.get((q, r))
     
+    def _set_piece_at(self, coord: Tuple[int, int], piece: Optional[Tuple[str, str]]):
+        """Put a piece (or None) on a tile and update bitboards and hash.
+
+        Every change to tile contents goes through here so the bitboards
+        and zobrist_hash never disagree with piece_at.
+        """
+        idx = self.coord_to_index[coord]
+        bit = 1 << idx
+        old_piece = self.piece_at[idx]
+        if old_piece is not None:
+            self.piece_bitboards[old_piece] ^= bit
+            self.color_bitboards[old_piece[0]] ^= bit
+            self.zobrist_hash ^= self.zobrist_keys[old_piece][idx]
+        self.piece_at[idx] = piece
+        if piece is not None:
+            self.piece_bitboards[piece] |= bit
+            self.color_bitboards[piece[0]] |= bit
+            self.zobrist_hash ^= self.zobrist_keys[piece][idx]
+
+    @property
+    def current_turn(self) -> str:
+        """Color to move."""
+        return self._current_turn
+
+    @current_turn.setter
+    def current_turn(self, color: str):
+        if color != self._current_turn:
+            self.zobrist_hash ^= self.zobrist_side
+            self._current_turn = color
+
+    @property
+    def en_passant_target(self) -> Optional[Tuple[int, int]]:
+        """Square a pawn can capture onto en passant, if any."""
+        return self._en_passant_target
+
+    @en_passant_target.setter
+    def en_passant_target(self, coord: Optional[Tuple[int, int]]):
+        old = self._en_passant_target
+        if coord == old:
+            return
+        if old is not None:
+            self.zobrist_hash ^= self.zobrist_en_passant[self.coord_to_index[old]]
+        if coord is not None:
+            self.zobrist_hash ^= self.zobrist_en_passant[self.coord_to_index[coord]]
+        self._en_passant_target = coord
+
+    def snapshot(self) -> BoardSnapshot:
+        """Capture the position and game state for a later restore().
+
+        Copies the flat piece array and the small bitboard dicts rather
+        than any tile objects.
+        """
+        return BoardSnapshot(
+            tuple(self.piece_at),
+            dict(self.piece_bitboards),
+            dict(self.color_bitboards),
+            self.zobrist_hash,
+            self.current_turn,
+            self.en_passant_target,
+            self.pending_promotion,
+            {color: Counter(counts) for color, counts in self.captured_pieces.items()},
+        )
+
+    def restore(self, snap: BoardSnapshot):
+        """Return the board to a snapshot() taken earlier.
+
+        The snapshot may come from another board of the same size, whose
+        tile indices and Zobrist keys match this one's.
+        """
+        self.piece_at[:] = snap.piece_at
+        self.piece_bitboards = dict(snap.piece_bitboards)
+        self.color_bitboards = dict(snap.color_bitboards)
+        # The snapshot's hash already covers side to move and en passant
+        self.zobrist_hash = snap.zobrist_hash
+        self._current_turn = snap.current_turn
+        self._en_passant_target = snap.en_passant_target
+        self.pending_promotion = snap.pending_promotion
+        self.captured_pieces = {color: Counter(counts) for color, counts in snap.captured_pieces.items()}
+
+    def iter_squares(self, bb: int):
+        """Yield the (q, r) of each tile set in a bitboard, in tile-index order."""
+        index_to_coord = self.index_to_coord
+        for idx in _iter_bits(bb):
+            yield index_to_coord[idx]
+
+    def compute_pins(self, color: str) -> int:
+        """Bitboard of color's pieces pinned to their own king.
+
+        A piece is pinned when it is the nearest piece on a ray from the
+        king and the next piece beyond it is an enemy slider moving along
+        that ray.
+        """
+        king_bb = self.piece_bitboards[(color, "king")]
+        if not king_bb:
+            return 0
+        king_idx = (king_bb & -king_bb).bit_length() - 1
+        own = self.color_bitboards[color]
+        occupied = own | self.color_bitboards[OPPONENT[color]]
+        enemy = OPPONENT[color]
+        queens = self.piece_bitboards[(enemy, "queen")]
+        pinned = 0
+        for reach, ray_masks, sliders in (
+                (self.orthogonal_reach, self.orthogonal_ray_masks, self.piece_bitboards[(enemy, "rook")] | queens),
+                (self.diagonal_reach, self.diagonal_ray_masks, self.piece_bitboards[(enemy, "bishop")] | queens)):
+            if not reach[king_idx] & sliders:
+                continue
+            for mask, ascending in ray_masks[king_idx]:
+                if not mask & sliders:
+                    continue
+                blockers = mask & occupied
+                nearest = blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+                if not nearest & own:
+                    continue
+                blockers ^= nearest
+                if not blockers:
+                    continue
+                second = blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+                if second & sliders:
+                    pinned |= nearest
+        return pinned
+
     def place_piece(self, q: int, r: int, color: str, piece_name: str) -> bool:
         """Place a piece on the board."""
-        tile = self.get_tile(q, r)
-        if tile:
-            tile.set_piece(color, piece_name)
+        if (q, r) in self.tiles:
+            self._set_piece_at((q, r), (color, piece_name))
+            return True
+        return False
+
+    def remove_piece(self, q: int, r: int) -> bool:
+        """Remove whatever piece stands on a tile."""
+        if (q, r) in self.tiles:
+            self._set_piece_at((q, r), None)
             return True
         return False
+
+    def clear_pieces(self):
+        """Remove every piece from the board."""
+        for coord in self.tiles:
+            self._set_piece_at(coord, None)
+
+    def set_pieces(self, placements):
+        """Replace the whole position with (q, r, color, piece_name) placements.
+
+        Builds the piece array, bitboards and hash in one pass instead of
+        clearing and placing square by square.
+        """
+        coord_to_index = self.coord_to_index
+        piece_at = [None] * len(self.piece_at)
+        piece_bitboards = dict.fromkeys(self.piece_bitboards, 0)
+        color_bitboards = {"white": 0, "black": 0}
+        zobrist_hash = 0
+        for q, r, color, piece_name in placements:
+            idx = coord_to_index[(q, r)]
+            piece = (color, piece_name)
+            bit = 1 << idx
+            old_piece = piece_at[idx]
+            if old_piece is not None:
+                piece_bitboards[old_piece] ^= bit
+                color_bitboards[old_piece[0]] ^= bit
+                zobrist_hash ^= self.zobrist_keys[old_piece][idx]
+            piece_at[idx] = piece
+            piece_bitboards[piece] |= bit
+            color_bitboards[color] |= bit
+            zobrist_hash ^= self.zobrist_keys[piece][idx]
+        # Side to move and en passant are unchanged; keep their keys in
+        if self._current_turn == "black":
+            zobrist_hash ^= self.zobrist_side
+        if self._en_passant_target is not None:
+            zobrist_hash ^= self.zobrist_en_passant[coord_to_index[self._en_passant_target]]
+        self.piece_at[:] = piece_at
+        self.piece_bitboards = piece_bitboards
+        self.color_bitboards = color_bitboards
+        self.zobrist_hash = zobrist_hash
     
-    def move_piece(self, from_q: int, from_r: int, to_q: int, to_r: int) -> bool:
-        """Move a piece from one tile to another."""
-        from_tile = self.get_tile(from_q, from_r)
-        to_tile = self.get_tile(to_q, to_r)
+    def move_piece(self, from_q: int, from_r: int, to_q: int, to_r: int) -> Optional[MoveRecord]:
+        """Move a piece from one tile to another.
+
+        Returns a MoveRecord that unmake_move accepts, or None if the move
+        was not made.
+        """
+        coord_to_index = self.coord_to_index
+        piece_at = self.piece_at
+        from_idx = coord_to_index.get((from_q, from_r))
+        to_idx = coord_to_index.get((to_q, to_r))
         
-        if not from_tile or not to_tile or not from_tile.has_piece() or from_tile == to_tile:
-            return False
+        if from_idx is None or to_idx is None or piece_at[from_idx] is None or from_idx == to_idx:
+            return None
         
-        piece_color,piece_name = from_tile.get_piece()
+        moving_piece = piece_at[from_idx]
+        piece_color, piece_name = moving_piece
         
         # Check if it's this color's turn
         if piece_color != self.current_turn:
-            return False
+            return None
         
+        target_piece = piece_at[to_idx]
+        en_passant_capture = None
+        prev_en_passant = self.en_passant_target
+        prev_turn = self.current_turn
+        prev_pending_promotion = self.pending_promotion
+
         # Track captured piece before removing it
-        if to_tile.has_piece():
-            captured_color, captured_piece = to_tile.get_piece()
-            self.captured_pieces[captured_color].append(captured_piece)
+        if target_piece is not None:
+            captured_color, captured_piece = target_piece
+            self.captured_pieces[captured_color][captured_piece] += 1
         # Handle en-passant capture
         if piece_name == "pawn" and (to_q, to_r) == self.en_passant_target:
         # Remove the captured pawn
@@ -142,94 +600,137 @@ class HexBoard:
             else:
                 captured_pawn_pos = (to_q, to_r - 1)  # White pawn is one square "above"
         
-            captured_tile = self.get_tile(*captured_pawn_pos)
-            if captured_tile:
+            captured_idx = coord_to_index.get(captured_pawn_pos)
+            if captured_idx is not None:
                 # track en passant capture
-                captured_color, captured_piece = captured_tile.get_piece()
-                self.captured_pieces[captured_color].append(captured_piece)
-                captured_tile.remove_piece()
+                en_passant_capture = (captured_pawn_pos, piece_at[captured_idx])
+                captured_color, captured_piece = piece_at[captured_idx]
+                self.captured_pieces[captured_color][captured_piece] += 1
+                self._set_piece_at(captured_pawn_pos, None)
 
         # Clear en-passant target before checking for new two-square pawn moves
         self.en_passant_target = None
 
         # Check if this is a two-square pawn move (sets new en-passant target)
         if piece_name == "pawn":
-            white_pawn_starts = [
-                (-4, 5), (-3, 4), (-2, 3), (-1, 2), (0, 1),
-                (1, 1), (2, 1), (3, 1), (4, 1)
-            ]
-            black_pawn_starts = [
-                (4, -5), (3, -4), (2, -3), (1, -2), (0, -1),
-                (-1, -1), (-2, -1), (-3, -1), (-4, -1)
-            ]
-        
-            if piece_color == "white" and (from_q, from_r) in white_pawn_starts:
+            if piece_color == "white" and (from_q, from_r) in WHITE_PAWN_STARTS:
                 # Check if moved two squares
                 if to_r == from_r - 2:
                     self.en_passant_target = (from_q, from_r - 1)
-            elif piece_color == "black" and (from_q, from_r) in black_pawn_starts:
+            elif piece_color == "black" and (from_q, from_r) in BLACK_PAWN_STARTS:
                 # Check if moved two squares
                 if to_r == from_r + 2:
                     self.en_passant_target = (from_q, from_r + 1)
         # Make the move
-        to_tile.piece = from_tile.piece
-        from_tile.remove_piece()
+        self._set_piece_at((to_q, to_r), moving_piece)
+        self._set_piece_at((from_q, from_r), None)
+        record = MoveRecord(from_q, from_r, to_q, to_r, moving_piece, target_piece,
+                            en_passant_capture, prev_en_passant, prev_turn,
+                            prev_pending_promotion)
         
         # Check for pawn promotion - ADD THIS BLOCK
         if piece_name == "pawn" and self.is_promotion_square(to_q, to_r, piece_color):
             self.pending_promotion = (to_q, to_r, piece_color)
             # Don't switch turns yet - wait for promotion choice
-            return True
+            return record
         # Switch turns
-        self.current_turn = "black" if self.current_turn == "white" else "white"
-        return True
+        self.current_turn = OPPONENT[self.current_turn]
+        return record
+
+    def unmake_move(self, record: MoveRecord):
+        """Take back a move made by move_piece, including any promotion."""
+        # Writing the original pawn back also undoes a promotion
+        self._set_piece_at((record.from_q, record.from_r), record.moved_piece)
+        self._set_piece_at((record.to_q, record.to_r), record.captured_piece)
+        if record.captured_piece is not None:
+            captured_color, captured_name = record.captured_piece
+            self.captured_pieces[captured_color][captured_name] -= 1
+        if record.en_passant_capture is not None:
+            coord, pawn = record.en_passant_capture
+            self._set_piece_at(coord, pawn)
+            self.captured_pieces[pawn[0]][pawn[1]] -= 1
+
+        self.en_passant_target = record.prev_en_passant
+        self.current_turn = record.prev_turn
+        self.pending_promotion = record.prev_pending_promotion
     
+    def _toggle_raw_move(self, from_idx: int, to_idx: int, moving_piece, captured_piece):
+        """XOR a move into the bitboards and hash.
+
+        Applying the same toggle twice restores the original state, so
+        make_raw_move and unmake_raw_move share it.
+        """
+        move_mask = (1 << from_idx) | (1 << to_idx)
+        keys = self.zobrist_keys[moving_piece]
+        self.piece_bitboards[moving_piece] ^= move_mask
+        self.color_bitboards[moving_piece[0]] ^= move_mask
+        self.zobrist_hash ^= keys[from_idx] ^ keys[to_idx]
+        if captured_piece is not None:
+            to_bit = 1 << to_idx
+            self.piece_bitboards[captured_piece] ^= to_bit
+            self.color_bitboards[captured_piece[0]] ^= to_bit
+            self.zobrist_hash ^= self.zobrist_keys[captured_piece][to_idx]
+
+    def make_raw_move(self, from_q: int, from_r: int, to_q: int, to_r: int):
+        """Move a piece without any turn, en-passant or promotion bookkeeping.
+
+        Used for look-ahead probes. Returns whatever stood on the destination
+        so unmake_raw_move can put it back.
+        """
+        from_idx = self.coord_to_index[(from_q, from_r)]
+        to_idx = self.coord_to_index[(to_q, to_r)]
+        piece_at = self.piece_at
+        moving_piece = piece_at[from_idx]
+        captured_piece = piece_at[to_idx]
+        self._toggle_raw_move(from_idx, to_idx, moving_piece, captured_piece)
+        piece_at[to_idx] = moving_piece
+        piece_at[from_idx] = None
+        return captured_piece
+
+    def unmake_raw_move(self, from_q: int, from_r: int, to_q: int, to_r: int, captured_piece):
+        """Revert a make_raw_move."""
+        from_idx = self.coord_to_index[(from_q, from_r)]
+        to_idx = self.coord_to_index[(to_q, to_r)]
+        piece_at = self.piece_at
+        moving_piece = piece_at[to_idx]
+        self._toggle_raw_move(from_idx, to_idx, moving_piece, captured_piece)
+        piece_at[from_idx] = moving_piece
+        piece_at[to_idx] = captured_piece
+
     def get_hex_corners(self, center_x: float, center_y: float) -> list:
         """Calculate the six corner points of a hexagon."""
-        corners = []
-        for i in range(6):
-            angle_deg = 60 * i
-            angle_rad = math.pi / 180 * angle_deg
-            x = center_x + self.radius * math.cos(angle_rad)
-            y = center_y + self.radius * math.sin(angle_rad)
-            corners.append((x, y))
-        return corners
+        return [(center_x + dx, center_y + dy) for dx, dy in self._corner_offsets]
+
+    def get_all_hex_corners(self, center_x: float, center_y: float) -> Dict[Tuple[int, int], list]:
+        """Corner points of every tile at its on-screen position, in one pass.
+
+        Honors the flipped view, so keys are board coordinates while the
+        points are where that tile is drawn.
+        """
+        sign = self.flip_sign
+        offsets = self._corner_offsets
+        pixel_offsets = self.pixel_offsets
+        all_corners = {}
+        for (q, r) in self.tiles:
+            # The board is point-symmetric, so (-q, -r) is always a tile too
+            ox, oy = pixel_offsets[(sign * q, sign * r)]
+            x, y = center_x + ox, center_y + oy
+            all_corners[(q, r)] = [(x + dx, y + dy) for dx, dy in offsets]
+        return all_corners
     
-    def get_neighbors(self, q: int, r: int) -> list:
+    def get_neighbors(self, q: int, r: int) -> Tuple[Tuple[int, int], ...]:
         """Get all six neighboring hex coordinates."""
-        # Six directions in axial coordinates
-        directions = [
-            (1, 0), (1, -1), (0, -1),
-            (-1, 0), (-1, 1), (0, 1)
-        ]
-        neighbors = []
-        for dq, dr in directions:
-            nq, nr = q + dq, r + dr
-            if (nq, nr) in self.tiles:
-                neighbors.append((nq, nr))
-        return neighbors
+        return self.neighbors.get((q, r), ())
     
     def toggle_flip(self):
         """Toggle the visual flipped state of the board."""
         self.flipped = not self.flipped
+        self.flip_sign = -self.flip_sign
     
     def is_promotion_square(self, q: int, r: int, color: str) -> bool:
         """Check if a square is in the promotion zone for the given color."""
-        # White pawns promote on black's back rank
-        if color == "white":
-            # Black's back rank positions
-            black_back_rank = [
-            (4, -5), (3, -5), (2, -5), (1, -5), (0, -5),
-            (-1, -4), (-2, -3), (-3, -2), (-4, -1)
-        ]
-            return (q, r) in black_back_rank
-        else:
-            # Black pawns promote on white's back rank
-            white_back_rank = [
-            (-4, 5), (-3, 5), (-2, 5), (-1, 5), (0, 5),
-            (1, 4), (2, 3), (3, 2), (4, 1)
-            ]
-            return (q, r) in white_back_rank
+        # White pawns promote on black's back rank and vice versa
+        return (q, r) in PROMOTION_SQUARES[color]
     
     def promote_pawn(self, piece_name: str) -> bool:
         """Promote the pending pawn to the specified piece."""
@@ -243,63 +744,31 @@ class HexBoard:
             return False
         
         # Replace pawn with chosen piece
-        tile.set_piece(color, piece_name)
+        self._set_piece_at((q, r), (color, piece_name))
         
         # Clear promotion state
         self.pending_promotion = None
         
         # Now switch turns
-        self.current_turn = "black" if self.current_turn == "white" else "white"
+        self.current_turn = OPPONENT[self.current_turn]
         
         return True
 
-    def capture_move_info(self, from_q, from_r, to_q, to_r):
-        """Capture all info needed to undo a move."""
-        from_tile = self.get_tile(from_q, from_r)
-        to_tile = self.get_tile(to_q, to_r)
-        
-        move_info = {
-            'piece': from_tile.get_piece(),
-            'captured': to_tile.get_piece() if to_tile.has_piece() else None,
-            'en_passant_target': self.en_passant_target,
-            'castling_rights': getattr(self, 'castling_rights', {}).copy() if hasattr(self, 'castling_rights') else {},
-            # Add any other state you need to track
-        }
-        return move_info
-
-    def undo_move(self, from_q, from_r, to_q, to_r, move_info):
-        """Undo a move using captured info."""
-        # Move piece back
-        to_tile = self.get_tile(to_q, to_r)
-        from_tile = self.get_tile(from_q, from_r)
-        
-        from_tile.place_piece(*move_info['piece'])
-        to_tile.remove_piece()
-        
-        # Restore captured piece if any
-        if move_info['captured']:
-            to_tile.place_piece(*move_info['captured'])
-        
-        # Restore board state
-        self.en_passant_target = move_info['en_passant_target']
-        if hasattr(self, 'castling_rights'):
-            self.castling_rights = move_info['castling_rights']
-        
-        # Toggle turn back
-        self.current_turn = "white" if self.current_turn == "black" else "black"
-
 class HexGeometry:
     """Geometric calculations for hexagonal boards."""
     
     @staticmethod
     def axial_distance(q1: int, r1: int, q2: int, r2: int) -> int:
         """Calculate distance between two hexagons in axial coordinates."""
-        return (abs(q1 - q2) + abs(q1 + r1 - q2 - r2) + abs(r1 - r2)) // 2
+        # Cube metric: the largest of the three coordinate differences
+        dq = q1 - q2
+        dr = r1 - r2
+        return max(abs(dq), abs(dr), abs(dq + dr))
     
     @staticmethod
     def distance_from_center(q: int, r: int) -> int:
         """Calculate distance from board center (0, 0)."""
-        return HexGeometry.axial_distance(q, r, 0, 0)
+        return max(abs(q), abs(r), abs(q + r))
     
     @staticmethod
     def distance_from_edge(q: int, r: int, board_size: int = 5) -> int:
@@ -1,32 +1,54 @@
 import math
-import time
 import pygame
-from typing import Tuple
+from typing import Tuple, Optional, List
 from constants import *
 from game import MoveValidator
 from evaluation import Evaluator
+from hex_board import hex_corners
+
+# Rendered text surfaces kept by Renderer._text before the cache is reset
+TEXT_CACHE_SIZE = 256
+
+# Brightness offsets for the engine-thinking banner, one per drawn frame;
+# a full pulse takes about a second at 60 fps
+PULSE_STEPS = 64
+_PULSE = tuple(int(abs(math.sin(math.pi * i / PULSE_STEPS) * 30)) for i in range(PULSE_STEPS))
+
+# (radius, color) -> translucent hexagon surface; see hex_overlay
+_hex_overlays = {}
+
+
+def hex_overlay(radius: float, color) -> pygame.Surface:
+    """A hexagon of the given (RGBA) color on a transparent 2r x 2r surface.
+
+    Built once per radius and color and reused for every highlight.
+    """
+    key = (radius, color)
+    overlay = _hex_overlays.get(key)
+    if overlay is None:
+        overlay = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.polygon(overlay, color, hex_corners(radius, radius, radius))
+        _hex_overlays[key] = overlay
+    return overlay
+
 
 def draw_hexagon(surface: pygame.Surface, center: Tuple[float, float],
                  radius: float, color: Tuple[int, int, int],
-                 outline_color: Tuple[int, int, int], highlight: bool = False):
-    """Draw a single hexagon with outline."""
-    corners = []
-    for i in range(6):
-        angle_deg = 60 * i
-        angle_rad = math.pi / 180 * angle_deg
-        x = center[0] + radius * math.cos(angle_rad)
-        y = center[1] + radius * math.sin(angle_rad)
-        corners.append((x, y))
+                 outline_color: Tuple[int, int, int], highlight: bool = False,
+                 corners: Optional[List[Tuple[float, float]]] = None):
+    """Draw a single hexagon with outline.
+
+    Pass precomputed ``corners`` to skip the trigonometry.
+    """
+    if corners is None:
+        corners = hex_corners(center[0], center[1], radius)
 
     # Draw filled hexagon
     pygame.draw.polygon(surface, color, corners)
 
     # Draw highlight if selected
     if highlight:
-        s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        s_corners = [(c[0] - center[0] + radius, c[1] - center[1] + radius) for c in corners]
-        pygame.draw.polygon(s, HIGHLIGHT, s_corners)
-        surface.blit(s, (center[0] - radius, center[1] - radius))
+        surface.blit(hex_overlay(radius, HIGHLIGHT), (center[0] - radius, center[1] - radius))
 
     # Draw outline
     outline_width = 3 if highlight else 2
@@ -36,7 +58,8 @@ def draw_hexagon(surface: pygame.Surface, center: Tuple[float, float],
 class Renderer:
     """Render board, pieces and UI. Keeps main loop smaller and focused on events/state."""
 
-    def __init__(self, board, piece_manager, font, small_font, turn_font, window_w, window_h):
+    def __init__(self, board, piece_manager, font, small_font, turn_font, window_w, window_h,
+                 move_validator=None):
         self.board = board
         self.piece_manager = piece_manager
         self.font = font
@@ -44,6 +67,80 @@ class Renderer:
         self.turn_font = turn_font
         self.window_w = window_w
         self.window_h = window_h
+        self.move_validator = move_validator if move_validator is not None else MoveValidator(board)
+        # (position key, status) of the last get_game_status call; see _game_status
+        self._status = (None, None)
+        # (position key, Evaluator.evaluate result); see _evaluation
+        self._eval = (None, None)
+        # Per-tile draw positions, rebuilt by _tile_layout when the view changes
+        self._layout = []
+        self._layout_key = None
+        # (font, text, color) -> rendered surface; see _text
+        self._text_cache = {}
+        # piece -> (image, half width, half height) for centered blits
+        self._piece_sprites = {}
+        # (color, name, size) -> piece image scaled for the captured panels
+        self._captured_icons = {}
+        # (width, height) -> translucent captured-panel background
+        self._panel_backgrounds = {}
+        # (size, fill, label, label color) -> drawn button; see _button
+        self._buttons = {}
+        # Background with the bare board drawn on it; see _board_background
+        self._background = None
+        self._background_key = None
+        # Frames drawn while the engine was thinking; steps the banner pulse
+        self._pulse_frame = 0
+
+    def _game_status(self):
+        """get_game_status for the current position, computed once per position."""
+        board = self.board
+        # The hash covers pieces, side to move and en passant
+        key = (board, board.zobrist_hash)
+        cached_key, status = self._status
+        if key != cached_key:
+            self.move_validator.board = board
+            self.move_validator.move_generator.board = board
+            status = self.move_validator.get_game_status()
+            self._status = (key, status)
+        return status
+
+    def _evaluation(self):
+        """Evaluator.evaluate for the current position, computed once per position."""
+        board = self.board
+        key = (board, board.zobrist_hash)
+        cached_key, evaluation = self._eval
+        if key != cached_key:
+            evaluation = Evaluator.evaluate(board)
+            self._eval = (key, evaluation)
+        return evaluation
+
+    def _tile_layout(self, center_x, center_y):
+        """(coord, tile, x, y, corners, pixel) for every tile at its on-screen position.
+
+        pixel is the center rounded to whole pixels the way pygame.Rect
+        does it, so sprites blitted from it line up with get_rect(center=...).
+
+        Tile positions only depend on the board, its radius, the flip and
+        the board center, so they are computed once per view rather than
+        every frame.
+        """
+        board = self.board
+        key = (board, board.radius, board.flipped, center_x, center_y)
+        if key != self._layout_key:
+            all_corners = board.get_all_hex_corners(center_x, center_y)
+            # If the board is flipped, render tile (q,r) at the pixel
+            # position of (-q,-r) so the visual orientation is rotated 180°.
+            sign = board.flip_sign
+            layout = []
+            for (q, r), tile in board.tiles.items():
+                x, y = board.axial_to_pixel(sign * q, sign * r, center_x, center_y)
+                tile.pixel_pos = (x, y)
+                # Rect rounds halves away from zero; on-screen centers are positive
+                pixel = (math.floor(x + 0.5), math.floor(y + 0.5))
+                layout.append(((q, r), tile, x, y, all_corners[(q, r)], pixel))
+            self._layout = layout
+            self._layout_key = key
+        return self._layout
 
     def _draw_captured_pieces(self, screen, center_x, center_y):
         """Draw captured pieces - Green box (left) = your captures, Red box (right) = your losses."""
@@ -63,10 +160,15 @@ class Renderer:
         available_h = self.window_h - available_top - 70
 
         # ---- Get captured pieces ----
-        white_captured = self.board.captured_pieces.get("white", [])
-        black_captured = self.board.captured_pieces.get("black", [])
+        # Expand the per-type counts, cheapest first, so an overflowing
+        # panel (which shows the tail) keeps the most valuable captures.
+        def expand(counts):
+            return [name for name in PIECE_VALUES for _ in range(counts.get(name, 0))]
+
+        white_captured = expand(self.board.captured_pieces.get("white", {}))
+        black_captured = expand(self.board.captured_pieces.get("black", {}))
 
-        if getattr(self.board, "flipped", False):
+        if self.board.flipped:
             # Viewing from black side
             green_pieces, green_color = white_captured, "white"
             red_pieces, red_color = black_captured, "black"
@@ -102,13 +204,16 @@ class Renderer:
             panel_rect = pygame.Rect(panel_x, panel_y, panel_w, panel_h)
 
             # Background + border
-            panel_surf = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
-            pygame.draw.rect(panel_surf, (245, 245, 245, 230), panel_surf.get_rect(), border_radius=6)
+            panel_surf = self._panel_backgrounds.get((panel_w, panel_h))
+            if panel_surf is None:
+                panel_surf = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+                pygame.draw.rect(panel_surf, (245, 245, 245, 230), panel_surf.get_rect(), border_radius=6)
+                self._panel_backgrounds[(panel_w, panel_h)] = panel_surf
             screen.blit(panel_surf, panel_rect)
             pygame.draw.rect(screen, border_color, panel_rect, 3, border_radius=6)
 
             # Header label
-            text = self.small_font.render(label, True, text_color)
+            text = self._text(self.small_font, label, text_color)
             text_rect = text.get_rect(center=(panel_x + panel_w // 2, panel_y + header_h // 2))
             screen.blit(text, text_rect)
 
@@ -119,15 +224,14 @@ class Renderer:
                 x = panel_x + side_pad + col * h_space + h_space // 2
                 y = start_y + row * v_space + v_space // 2
 
-                img = self.piece_manager.get_image(piece_color, piece_name)
-                if img:
-                    scaled = pygame.transform.smoothscale(img, (piece_size, piece_size))
+                scaled = self._captured_icon(piece_color, piece_name, piece_size)
+                if scaled:
                     screen.blit(scaled, scaled.get_rect(center=(x, y)))
 
             # Overflow indicator
             if overflow:
                 extra = len(pieces) - len(display)
-                overflow_txt = self.small_font.render(f"↑ +{extra}", True, text_color)
+                overflow_txt = self._text(self.small_font, f"↑ +{extra}", text_color)
                 overflow_rect = overflow_txt.get_rect(center=(panel_x + panel_w // 2, start_y + 8))
                 bg = overflow_rect.inflate(8, 4)
                 pygame.draw.rect(screen, (255, 255, 255, 200), bg, border_radius=3)
@@ -154,81 +258,123 @@ class Renderer:
             text_color=(150, 40, 40),
         )
 
+    def _text(self, font, text, color):
+        """font.render(text, True, color), rasterized once per distinct string."""
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+
+    def _piece_sprite(self, piece):
+        """(image, half width, half height) for a (color, name) piece, or None."""
+        try:
+            return self._piece_sprites[piece]
+        except KeyError:
+            pass
+        image = self.piece_manager.get_image(*piece)
+        sprite = None
+        if image:
+            width, height = image.get_size()
+            sprite = (image, width // 2, height // 2)
+        self._piece_sprites[piece] = sprite
+        return sprite
+
+    def _captured_icon(self, piece_color, piece_name, size):
+        """The piece image smoothscaled to size x size, scaled once per size; or None."""
+        key = (piece_color, piece_name, size)
+        try:
+            return self._captured_icons[key]
+        except KeyError:
+            pass
+        img = self.piece_manager.get_image(piece_color, piece_name)
+        icon = pygame.transform.smoothscale(img, (size, size)) if img else None
+        self._captured_icons[key] = icon
+        return icon
+
+    def _button(self, size, fill, label, label_color):
+        """A rounded button with a centered label, drawn once per look and size."""
+        key = (size, fill, label, label_color)
+        button = self._buttons.get(key)
+        if button is None:
+            # Transparent outside the rounded corners
+            button = pygame.Surface(size, pygame.SRCALPHA)
+            rect = button.get_rect()
+            pygame.draw.rect(button, fill, rect, border_radius=5)
+            pygame.draw.rect(button, (40, 40, 40), rect, 2, border_radius=5)
+            text = self._text(self.small_font, label, label_color)
+            button.blit(text, text.get_rect(center=rect.center))
+            self._buttons[key] = button
+        return button
+
+    def _board_background(self, screen, center_x, center_y):
+        """The screen background with every tile's fill and outline drawn on.
+
+        Rebuilt together with the tile layout, so a frame blits the bare
+        board in one call and only draws highlights and pieces over it.
+        """
+        layout = self._tile_layout(center_x, center_y)
+        key = (self._layout_key, screen.get_size())
+        if key != self._background_key:
+            background = pygame.Surface(screen.get_size(), 0, screen)
+            background.fill(BACKGROUND)
+            radius = self.board.radius
+            for _, tile, x, y, tile_corners, _ in layout:
+                draw_hexagon(background, (x, y), radius, HEX_PALETTE[tile.color_index], OUTLINE,
+                             corners=tile_corners)
+            self._background = background
+            self._background_key = key
+        return self._background
+
     def render(self, screen, center_x, center_y, mouse_pos, hovered_coord,
                selected_tile, dragging, drag_piece, legal_moves,
                reset_button_rect, undo_button_rect, flip_button_rect,
                reset_hover, undo_hover, flip_hover, history,
                promotion_buttons=None, promotion_hover=None, flip_locked=False,
                last_move=None, engine_thinking=False):
-        # Clear screen
-        screen.fill(BACKGROUND)
-
-        # Draw all hexagons and pieces
-        for (q, r), tile in self.board.tiles.items():
-            # If the board is flipped, render tile (q,r) at the pixel
-            # position of (-q,-r) so the visual orientation is rotated 180°.
-            if getattr(self.board, 'flipped', False):
-                display_q, display_r = -q, -r
-            else:
-                display_q, display_r = q, r
-
-            x, y = self.board.axial_to_pixel(display_q, display_r, center_x, center_y)
-            tile.pixel_pos = (x, y)
-
-            # Check if this tile is part of the last move
-            is_last_move_start = last_move and (q, r) == (last_move[0], last_move[1])
-            is_last_move_end = last_move and (q, r) == (last_move[2], last_move[3])
-            
+        # Clear screen and draw the bare board
+        screen.blit(self._board_background(screen, center_x, center_y), (0, 0))
+
+        # Draw highlights, overlays and pieces
+        radius = self.board.radius
+        # Everything the loop compares against or blits is resolved once per frame
+        last_start = (last_move[0], last_move[1]) if last_move else None
+        last_end = (last_move[2], last_move[3]) if last_move else None
+        hidden = selected_tile if dragging else None  # The dragged piece's square
+        start_overlay = hex_overlay(radius, ENGINE_MOVE_START)
+        end_overlay = hex_overlay(radius, ENGINE_MOVE_END)
+        legal_overlay = hex_overlay(radius, LEGAL_MOVE_HIGHLIGHT)
+        piece_sprite = self._piece_sprite
+        blit = screen.blit
+        # Pieces go on top of every highlight, in one blits call after the loop
+        piece_blits = []
+        for coord, tile, x, y, tile_corners, (px, py) in self._tile_layout(center_x, center_y):
             # Highlight if selected or hovered
-            highlight = (q, r) == selected_tile or (q, r) == hovered_coord
-            is_legal_move = (q, r) in legal_moves
-
-            draw_hexagon(screen, (x, y), self.board.radius, tile.color, OUTLINE, highlight)
+            if coord == selected_tile or coord == hovered_coord:
+                draw_hexagon(screen, (x, y), radius, HEX_PALETTE[tile.color_index], OUTLINE, True,
+                             corners=tile_corners)
 
             # Draw last move highlight (orange for start, yellow for end)
-            if is_last_move_start or is_last_move_end:
-                corners = []
-                for i in range(6):
-                    angle_deg = 60 * i
-                    angle_rad = math.pi / 180 * angle_deg
-                    cx = x + self.board.radius * math.cos(angle_rad)
-                    cy = y + self.board.radius * math.sin(angle_rad)
-                    corners.append((cx, cy))
-
-                s = pygame.Surface((self.board.radius * 2, self.board.radius * 2), pygame.SRCALPHA)
-                s_corners = [(c[0] - x + self.board.radius, c[1] - y + self.board.radius) for c in corners]
-                
-                # Use constants for engine move highlighting
-                if is_last_move_start:
-                    highlight_color = ENGINE_MOVE_START
-                else:
-                    highlight_color = ENGINE_MOVE_END
-                    
-                pygame.draw.polygon(s, highlight_color, s_corners)
-                screen.blit(s, (x - self.board.radius, y - self.board.radius))
+            if coord == last_start:
+                blit(start_overlay, (x - radius, y - radius))
+            elif coord == last_end:
+                blit(end_overlay, (x - radius, y - radius))
 
             # Draw legal move indicator
-            if is_legal_move:
-                corners = []
-                for i in range(6):
-                    angle_deg = 60 * i
-                    angle_rad = math.pi / 180 * angle_deg
-                    cx = x + self.board.radius * math.cos(angle_rad)
-                    cy = y + self.board.radius * math.sin(angle_rad)
-                    corners.append((cx, cy))
-
-                s = pygame.Surface((self.board.radius * 2, self.board.radius * 2), pygame.SRCALPHA)
-                s_corners = [(c[0] - x + self.board.radius, c[1] - y + self.board.radius) for c in corners]
-                pygame.draw.polygon(s, LEGAL_MOVE_HIGHLIGHT, s_corners)
-                screen.blit(s, (x - self.board.radius, y - self.board.radius))
+            if legal_moves >> tile.index & 1:
+                blit(legal_overlay, (x - radius, y - radius))
 
             # Draw piece if present and not being dragged
-            if tile.has_piece() and (not dragging or (q, r) != selected_tile):
-                piece_color, piece_name = tile.get_piece()
-                piece_image = self.piece_manager.get_image(piece_color, piece_name)
-                if piece_image:
-                    rect = piece_image.get_rect(center=(x, y))
-                    screen.blit(piece_image, rect)
+            piece = tile.piece
+            if piece is not None and coord != hidden:
+                sprite = piece_sprite(piece)
+                if sprite:
+                    piece_image, half_w, half_h = sprite
+                    piece_blits.append((piece_image, (px - half_w, py - half_h)))
+        screen.blits(piece_blits, doreturn=False)
 
         # Draw dragged piece at mouse position
         if dragging and drag_piece:
@@ -240,57 +386,49 @@ class Renderer:
 
         # Draw current turn indicator (top center)
         if engine_thinking:
-            turn_text = self.turn_font.render("ENGINE THINKING...", True, (255, 255, 255))
-            turn_bg_rect = turn_text.get_rect(center=(self.window_w // 2, 25))
-            turn_bg_rect.inflate_ip(20, 10)
+            turn_label = "ENGINE THINKING..."
+            text_color = (255, 255, 255)
+            outline_color = (255, 255, 255)
             # Pulsing effect for thinking indicator
-            pulse = int(abs(math.sin(time.time() * 3) * 30))
+            pulse = _PULSE[self._pulse_frame % PULSE_STEPS]
+            self._pulse_frame += 1
             turn_color = (70 + pulse, 130 + pulse, 180 + pulse)
-            pygame.draw.rect(screen, turn_color, turn_bg_rect, border_radius=5)
-            pygame.draw.rect(screen, (255, 255, 255), turn_bg_rect, 2, border_radius=5)
-            screen.blit(turn_text, turn_text.get_rect(center=(self.window_w // 2, 25)))
         else:
-            turn_text = self.turn_font.render(f"Turn: {self.board.current_turn.upper()}", True, (0, 0, 0))
-            turn_bg_rect = turn_text.get_rect(center=(self.window_w // 2, 25))
-            turn_bg_rect.inflate_ip(20, 10)
+            turn_label = f"Turn: {self.board.current_turn.upper()}"
+            white_to_move = self.board.current_turn == "white"
+            text_color = (0, 0, 0) if white_to_move else (255, 255, 255)
+            outline_color = (0, 0, 0)
+            turn_color = (240, 240, 240) if white_to_move else (80, 80, 80)
 
-        # Draw background for turn indicator
-        turn_color = (240, 240, 240) if self.board.current_turn == "white" else (80, 80, 80)
-        text_color = (0, 0, 0) if self.board.current_turn == "white" else (255, 255, 255)
-        pygame.draw.rect(screen, turn_color, turn_bg_rect, border_radius=5)
-        pygame.draw.rect(screen, (0, 0, 0), turn_bg_rect, 2, border_radius=5)
-
-        turn_text = self.turn_font.render(f"Turn: {self.board.current_turn.upper()}", True, text_color)
+        turn_text = self._text(self.turn_font, turn_label, text_color)
         turn_text_rect = turn_text.get_rect(center=(self.window_w // 2, 25))
+        turn_bg_rect = turn_text_rect.inflate(20, 10)
+        pygame.draw.rect(screen, turn_color, turn_bg_rect, border_radius=5)
+        pygame.draw.rect(screen, outline_color, turn_bg_rect, 2, border_radius=5)
         screen.blit(turn_text, turn_text_rect)
 
         # Draw info text
-        text = self.font.render(f"Hexagonal Chess - Gliński's Variant", True, (0, 0, 0))
+        text = self._text(self.font, f"Hexagonal Chess - Gliński's Variant", (0, 0, 0))
         screen.blit(text, (10, 10))
 
-        info_text = self.small_font.render("Click and drag pieces to move", True, (0, 0, 0))
+        info_text = self._text(self.small_font, "Click and drag pieces to move", (0, 0, 0))
         screen.blit(info_text, (10, 35))
 
         if hovered_coord:
-            coord_text = self.small_font.render(f"Hex: ({hovered_coord[0]}, {hovered_coord[1]})", True, (0, 0, 0))
+            coord_text = self._text(self.small_font, f"Hex: ({hovered_coord[0]}, {hovered_coord[1]})", (0, 0, 0))
             screen.blit(coord_text, (10, 55))
 
         # Draw reset button
         button_color = (100, 200, 100) if reset_hover else (70, 170, 70)
-        pygame.draw.rect(screen, button_color, reset_button_rect, border_radius=5)
-        pygame.draw.rect(screen, (40, 40, 40), reset_button_rect, 2, border_radius=5)
-        reset_text = self.small_font.render("RESET", True, (255, 255, 255))
-        reset_text_rect = reset_text.get_rect(center=reset_button_rect.center)
-        screen.blit(reset_text, reset_text_rect)
+        screen.blit(self._button(reset_button_rect.size, button_color, "RESET", (255, 255, 255)),
+                    reset_button_rect)
 
         # Draw undo button below reset (disabled when no history)
         undo_enabled = len(history) > 0
         undo_color = (100, 150, 250) if (undo_hover and undo_enabled) else ((80, 130, 220) if undo_enabled else (140, 140, 140))
-        pygame.draw.rect(screen, undo_color, undo_button_rect, border_radius=5)
-        pygame.draw.rect(screen, (40, 40, 40), undo_button_rect, 2, border_radius=5)
-        undo_text = self.small_font.render("UNDO", True, (255, 255, 255) if undo_enabled else (200, 200, 200))
-        undo_text_rect = undo_text.get_rect(center=undo_button_rect.center)
-        screen.blit(undo_text, undo_text_rect)
+        undo_text_color = (255, 255, 255) if undo_enabled else (200, 200, 200)
+        screen.blit(self._button(undo_button_rect.size, undo_color, "UNDO", undo_text_color),
+                    undo_button_rect)
 
         # Draw flip button below undo
         if flip_locked:
@@ -301,19 +439,14 @@ class Renderer:
             flip_color = (200, 150, 100) if flip_hover else (170, 120, 80)
             text_color = (255, 255, 255)
         
-        pygame.draw.rect(screen, flip_color, flip_button_rect, border_radius=5)
-        pygame.draw.rect(screen, (40, 40, 40), flip_button_rect, 2, border_radius=5)
-        flip_text = self.small_font.render("FLIP", True, text_color)
-        flip_text_rect = flip_text.get_rect(center=flip_button_rect.center)
-        screen.blit(flip_text, flip_text_rect)
+        screen.blit(self._button(flip_button_rect.size, flip_color, "FLIP", text_color), flip_button_rect)
 
         # Get and display game status
-        move_validator = MoveValidator(self.board)
-        game_status = move_validator.get_game_status()
+        game_status = self._game_status()
         status_y = self.window_h - 40
 
         if game_status == 'check':
-            status_text = self.turn_font.render("CHECK!", True, (200, 0, 0))
+            status_text = self._text(self.turn_font, "CHECK!", (200, 0, 0))
             status_rect = status_text.get_rect(center=(self.window_w // 2, status_y))
             # Draw background
             bg_rect = status_rect.inflate(20, 10)
@@ -322,7 +455,7 @@ class Renderer:
             screen.blit(status_text, status_rect)
         elif game_status == 'checkmate':
             winner = "BLACK" if self.board.current_turn == "white" else "WHITE"
-            status_text = self.turn_font.render(f"CHECKMATE! {winner} WINS!", True, (200, 0, 0))
+            status_text = self._text(self.turn_font, f"CHECKMATE! {winner} WINS!", (200, 0, 0))
             status_rect = status_text.get_rect(center=(self.window_w // 2, status_y))
             # Draw background
             bg_rect = status_rect.inflate(20, 10)
@@ -330,7 +463,7 @@ class Renderer:
             pygame.draw.rect(screen, (200, 0, 0), bg_rect, 3, border_radius=5)
             screen.blit(status_text, status_rect)
         elif game_status == 'stalemate':
-            status_text = self.turn_font.render("STALEMATE! DRAW!", True, (100, 100, 100))
+            status_text = self._text(self.turn_font, "STALEMATE! DRAW!", (100, 100, 100))
             status_rect = status_text.get_rect(center=(self.window_w // 2, status_y))
             # Draw background
             bg_rect = status_rect.inflate(20, 10)
@@ -341,7 +474,7 @@ class Renderer:
         # Draw captured pieces before evaluation bar
         self._draw_captured_pieces(screen, center_x, center_y)
         # Draw evaluation bar on the left: white advantage fills upward, black fills downward
-        score, total, phase = Evaluator.evaluate(self.board)
+        score, total, phase = self._evaluation()
         frac = 0.0
         if total and total > 0:
             # fraction in range -1..1
@@ -374,7 +507,7 @@ class Renderer:
         pygame.draw.line(screen, (0, 0, 0), (bar_x, center_y), (bar_x + bar_width, center_y), 2)
 
         # Numeric evaluation display below bar
-        eval_text = self.small_font.render(f"{int(score):+d}", True, (0, 0, 0))
+        eval_text = self._text(self.small_font, f"{int(score):+d}", (0, 0, 0))
         eval_rect = eval_text.get_rect(center=(bar_x + bar_width // 2, bar_y + bar_height + 12))
         screen.blit(eval_text, eval_rect)
 
@@ -387,7 +520,7 @@ class Renderer:
             
             # Draw promotion title
             q, r, color = self.board.pending_promotion
-            title_text = self.turn_font.render("Choose Promotion Piece", True, (255, 255, 255))
+            title_text = self._text(self.turn_font, "Choose Promotion Piece", (255, 255, 255))
             title_rect = title_text.get_rect(center=(self.window_w // 2, self.window_h // 2 - 80))
             screen.blit(title_text, title_rect)
             
@@ -405,7 +538,7 @@ class Renderer:
                     screen.blit(piece_image, img_rect)
                 else:
                     # Fallback text if image not available
-                    piece_text = self.small_font.render(piece.upper(), True, (255, 255, 255))
+                    piece_text = self._text(self.small_font, piece.upper(), (255, 255, 255))
                     text_rect = piece_text.get_rect(center=rect.center)
                     screen.blit(piece_text, text_rect)
 